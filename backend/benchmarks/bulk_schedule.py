@@ -0,0 +1,108 @@
+"""
+Custo de agendar um lote de mensagens em POST /messages/bulk, por etapa:
+
+- validação: o mesmo lote em JSON (TypeAdapter.validate_json) e em CSV
+  (csv.DictReader + validate_python). Não usa banco.
+- gravação: executemany de INSERT por linha (o que o flush do ORM faz),
+  INSERT multi-linha e COPY (copy_records_to_table), numa tabela TEMP
+  com o mesmo nome, que esconde public.messages só nesta sessão. Roda
+  apenas se o Postgres do .env responder.
+
+    cd backend && python -m benchmarks.bulk_schedule [linhas]
+"""
+import asyncio
+import csv
+import io
+import sys
+import time
+import uuid
+from datetime import datetime, timedelta, timezone
+
+import orjson
+from sqlalchemy import insert, text
+
+from src.db.database import engine
+from src.models.message import Message, MessageStatus
+from src.services.message_service import COPY_COLUMNS, parse_csv_batch, parse_json_batch
+
+ROWS = int(sys.argv[1]) if len(sys.argv) > 1 else 100_000
+
+def build_payloads():
+    start = datetime.now(timezone.utc) + timedelta(hours=1)
+    items = [
+        {
+            "jid": f"5511{i:09d}@s.whatsapp.net",
+            "instance": "instancia",
+            "content": f"Olá, seu lembrete número {i}",
+            "scheduled_at": (start + timedelta(seconds=i)).isoformat(),
+        }
+        for i in range(ROWS)
+    ]
+    buffer = io.StringIO()
+    writer = csv.DictWriter(buffer, fieldnames=list(items[0]))
+    writer.writeheader()
+    writer.writerows(items)
+    return orjson.dumps(items), buffer.getvalue().encode("utf-8")
+
+def timed(label: str, func):
+    started = time.perf_counter()
+    result = func()
+    elapsed = time.perf_counter() - started
+    print(f"{label:<22} {elapsed * 1000:9.1f} ms  {ROWS / elapsed:12,.0f} linhas/s")
+    return result
+
+async def timed_async(label: str, coro) -> None:
+    started = time.perf_counter()
+    await coro
+    elapsed = time.perf_counter() - started
+    print(f"{label:<22} {elapsed * 1000:9.1f} ms  {ROWS / elapsed:12,.0f} linhas/s")
+
+async def insert_benchmarks(messages) -> None:
+    batch_id = uuid.uuid4()
+    records = [
+        (uuid.uuid4(), m.jid, m.instance, m.content, False, m.scheduled_at, MessageStatus.SCHEDULED, batch_id)
+        for m in messages
+    ]
+    rows = [dict(zip(COPY_COLUMNS, record)) for record in records]
+    columns = ", ".join(COPY_COLUMNS)
+    placeholders = ", ".join(f":{c}" for c in COPY_COLUMNS)
+
+    async with engine.connect() as conn:
+        await conn.begin()
+        await conn.execute(text("CREATE TEMP TABLE messages (LIKE public.messages INCLUDING DEFAULTS)"))
+        driver = (await conn.get_raw_connection()).driver_connection
+
+        async def per_row():
+            # um INSERT por linha, em executemany, como o flush de session.add_all
+            raw_sql = f"INSERT INTO messages ({columns}) VALUES ({', '.join(f'${i + 1}' for i in range(len(COPY_COLUMNS)))})"
+            await driver.executemany(raw_sql, records)
+
+        async def multi_row():
+            await conn.execute(insert(Message.__table__), rows)
+
+        async def copy():
+            await driver.copy_records_to_table("messages", records=records, columns=COPY_COLUMNS)
+
+        for label, step in (("INSERT por linha", per_row), ("INSERT multi-linha", multi_row), ("COPY", copy)):
+            await conn.execute(text("TRUNCATE messages"))
+            await timed_async(label, step())
+        await conn.rollback()
+    await engine.dispose()
+
+async def main() -> int:
+    json_body, csv_body = build_payloads()
+    print(f"{ROWS:,} mensagens: JSON {len(json_body) / 1e6:.1f} MB, CSV {len(csv_body) / 1e6:.1f} MB")
+    messages = timed("validação JSON", lambda: parse_json_batch(json_body))
+    timed("validação CSV", lambda: parse_csv_batch(csv_body))
+    try:
+        async with engine.connect() as conn:
+            await conn.execute(text("SELECT 1"))
+    except Exception as e:
+        print(f"gravação ignorada: Postgres indisponível ({type(e).__name__})")
+        await engine.dispose()
+        return 0
+    await insert_benchmarks(messages)
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(asyncio.run(main()))
@@ -0,0 +1,72 @@
+"""
+Custo de encode/decode e tamanho do payload por codec do CacheService
+numa lista de 10k contatos, comparado ao modo de resposta renderizada.
+
+Os codecs são medidos isolados, sobre a mesma estrutura já passada pelo
+jsonable_encoder; o trabalho comum a todos (jsonable_encoder no miss,
+revalidação no Pydantic no hit) aparece em linhas próprias.
+
+    cd backend && python -m benchmarks.cache_codecs
+"""
+import time
+
+from fastapi.encoders import jsonable_encoder
+from pydantic import TypeAdapter
+
+from src.schemas.evolution_schemas import EvoContact, EvoContactsOut
+from src.services.cache_codecs import CODECS
+
+CONTACTS = 10_000
+ROUNDS = 20
+
+def make_contacts():
+    return [
+        EvoContact(
+            id=f"cm{i:020d}",
+            pushName=f"Contato {i}",
+            remoteJid=f"55119{i:08d}@s.whatsapp.net",
+        )
+        for i in range(CONTACTS)
+    ]
+
+def timed(func, *args) -> float:
+    started = time.perf_counter()
+    for _ in range(ROUNDS):
+        func(*args)
+    return (time.perf_counter() - started) / ROUNDS * 1000
+
+def main() -> None:
+    contacts = make_contacts()
+    adapter = TypeAdapter(EvoContactsOut)
+    value = jsonable_encoder(contacts)
+
+    print(f"{'codec':<22}{'encode ms':>12}{'decode ms':>12}{'bytes':>12}")
+    for name, factory in CODECS.items():
+        try:
+            codec = factory()
+        except RuntimeError as e:
+            print(f"{name:<22}{'-':>12}{'-':>12}{'-':>12}  ({e})")
+            continue
+        payload = codec.encode(value)
+        assert codec.decode(payload) == value, name
+        encode_ms = timed(codec.encode, value)
+        decode_ms = timed(codec.decode, payload)
+        print(f"{name:<22}{encode_ms:>12.2f}{decode_ms:>12.2f}{len(payload):>12}")
+
+    # comum a todos os codecs: jsonable_encoder antes do encode (miss) e
+    # revalidação do resultado decodificado (hit)
+    print()
+    print(f"{'jsonable_encoder (miss)':<34}{timed(jsonable_encoder, contacts):>10.2f} ms")
+    print(f"{'EvoContactsOut(...) (hit)':<34}{timed(lambda: EvoContactsOut(items=value)):>10.2f} ms")
+
+    out = EvoContactsOut(items=contacts)
+    render_ms = timed(lambda: adapter.dump_json(adapter.validate_python(out, from_attributes=True)))
+    body = adapter.dump_json(out)
+    # hit no modo renderizado: os bytes vão direto para o Response
+    hit_ms = timed(lambda: bytes(body))
+    print()
+    print(f"{'modo':<22}{'render ms':>12}{'hit ms':>12}{'bytes':>12}")
+    print(f"{'resposta renderizada':<22}{render_ms:>12.2f}{hit_ms:>12.2f}{len(body):>12}")
+
+if __name__ == "__main__":
+    main()
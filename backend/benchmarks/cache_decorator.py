@@ -0,0 +1,116 @@
+"""
+Overhead por requisição do CacheService.cached com tracing desligado.
+
+Usa um backend em memória no lugar do Redis para medir só o custo do
+decorator (montagem da chave, decode, counters/timers e logging).
+
+    cd backend && python -m benchmarks.cache_decorator  # requer o .env do backend
+"""
+import asyncio
+import logging
+import time
+from types import SimpleNamespace
+
+import structlog
+
+structlog.configure(
+    processors=[structlog.processors.JSONRenderer()],
+    logger_factory=structlog.stdlib.LoggerFactory(),
+    wrapper_class=structlog.make_filtering_bound_logger(logging.ERROR),
+    cache_logger_on_first_use=True,
+)
+
+from src.services.cache_service import CacheService, LocalCache  # noqa: E402
+
+ITERATIONS = 50_000
+
+class MemoryPipeline:
+    """Acumula os comandos e os executa em ordem no execute(), como o pipeline do redis-py."""
+    def __init__(self, redis: "MemoryRedis") -> None:
+        self.redis = redis
+        self.commands = []
+
+    def __getattr__(self, name):
+        def queue(*args, **kwargs):
+            self.commands.append((getattr(self.redis, name), args, kwargs))
+            return self
+        return queue
+
+    async def execute(self):
+        results = [await command(*args, **kwargs) for command, args, kwargs in self.commands]
+        self.commands.clear()
+        return results
+
+class MemoryRedis:
+    def __init__(self) -> None:
+        self.data = {}
+
+    def pipeline(self, transaction=True):
+        return MemoryPipeline(self)
+
+    async def get(self, key):
+        return self.data.get(key)
+
+    async def pttl(self, key):
+        return 60_000 if key in self.data else -2
+
+    async def setex(self, key, ttl, value):
+        self.data[key] = value.encode() if isinstance(value, str) else value
+
+    async def set(self, key, value, nx=False, px=None):
+        if nx and key in self.data:
+            return None
+        self.data[key] = value
+        return True
+
+    async def sadd(self, key, *members):
+        self.data.setdefault(key, set()).update(members)
+        return len(members)
+
+    async def expire(self, key, ttl, nx=False, gt=False):
+        return key in self.data
+
+    async def delete(self, *keys):
+        return sum(self.data.pop(key, None) is not None for key in keys)
+
+    async def publish(self, channel, message):
+        return 0
+
+    async def eval(self, script, numkeys, *args):
+        self.data.pop(args[0], None)
+        return 1
+
+PAYLOAD = [{"id": i, "username": f"user{i}", "email": f"user{i}@example.com"} for i in range(50)]
+
+async def view(current_user=None):
+    return PAYLOAD
+
+async def run(label: str, func, stats=None, **kwargs) -> None:
+    await func(**kwargs)
+    started = time.perf_counter()
+    for _ in range(ITERATIONS):
+        await func(**kwargs)
+    elapsed = time.perf_counter() - started
+    print(f"{label:<28} {elapsed / ITERATIONS * 1e6:8.2f} µs/call")
+    if stats is not None:
+        # no máximo o aquecimento pode ser miss; todas as chamadas medidas têm que ser hit
+        hits = stats.hits.value + stats.local_hits.value
+        assert stats.misses.value <= 1 and hits >= ITERATIONS, (
+            f"{label}: esperado {ITERATIONS} hits e no máximo 1 miss, veio hits={hits} misses={stats.misses.value}"
+        )
+
+async def main() -> None:
+    cache = CacheService(redis_client=MemoryRedis())
+    cached_view = cache.cached(timeout=60, key_prefix="bench")(view)
+    user = SimpleNamespace(id="6f1c3c1e-0000-0000-0000-000000000000")
+
+    await run("função sem cache", view, current_user=user)
+    await run("CacheService.cached (hit)", cached_view, stats=cache.stats("bench"), current_user=user)
+
+    local = CacheService(redis_client=MemoryRedis(), local_cache=LocalCache())
+    local_view = local.cached(timeout=60, key_prefix="bench_l1")(view)
+    local.local_cache.set("bench_l1:user:%s:view" % user.id, PAYLOAD, 3600)
+    await run("CacheService.cached (L1 hit)", local_view, stats=local.stats("bench_l1"), current_user=user)
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,103 @@
+"""
+Tempo da busca da fila do MessageDispatcher (DUE_SQL: lanes, vencidas e
+trava) numa tabela messages grande, sem e com o índice parcial
+ix_messages_due_lane; com o índice mede também a reivindicação inteira
+(CLAIM_SQL, que ainda grava o lote). Sai com código 1 se a mediana da
+busca com índice passar de 1 ms no servidor (Execution Time do EXPLAIN
+ANALYZE, sem o round-trip do driver, que também é mostrado).
+
+Usa uma tabela TEMP com o mesmo nome, que esconde public.messages só
+nesta sessão (nada é gravado na tabela real). Precisa do Postgres do .env
+com as migrations aplicadas:
+
+    cd backend && python -m benchmarks.due_queue [linhas_enviadas]
+"""
+import asyncio
+import statistics
+import sys
+import time
+
+from sqlalchemy import text
+
+from src.db.database import engine
+from src.models.message import MessageStatus, NIL_LANE
+from src.services.message_dispatcher import CLAIM_SQL, DUE_SQL
+
+SENT_ROWS = int(sys.argv[1]) if len(sys.argv) > 1 else 2_000_000
+DUE_ROWS = 5_000
+FUTURE_ROWS = 50_000
+BATCH_SIZE = 50
+RUNS = 200
+BUDGET_MS = 1.0
+
+POLL_SQL = text(f"{DUE_SQL} SELECT ctid FROM claimed")
+
+SEED_SQL = """
+    INSERT INTO messages (id, jid, instance, content, media, scheduled_at, status, created_at, updated_at, sent_at)
+    SELECT gen_random_uuid(), '5511' || g || '@s.whatsapp.net', 'instancia', 'oi', false,
+           now() {offset}, '{status}', now(), now(), {sent_at}
+      FROM generate_series(1, {rows}) AS g
+"""
+
+async def seed(conn) -> None:
+    await conn.execute(text("CREATE TEMP TABLE messages (LIKE public.messages INCLUDING DEFAULTS)"))
+    # só a PK: os índices da fila são criados (ou não) em main()
+    await conn.execute(text("ALTER TABLE messages ADD PRIMARY KEY (id)"))
+    for rows, status, offset, sent_at in (
+        (SENT_ROWS, MessageStatus.SENT, "- (g || ' seconds')::interval", "now()"),
+        (DUE_ROWS, MessageStatus.SCHEDULED, "- (g || ' seconds')::interval", "NULL"),
+        (FUTURE_ROWS, MessageStatus.SCHEDULED, "+ (g || ' seconds')::interval", "NULL"),
+    ):
+        await conn.execute(text(SEED_SQL.format(rows=rows, status=status, offset=offset, sent_at=sent_at)))
+    await conn.execute(text("ANALYZE messages"))
+
+async def measure(conn, label: str, statement) -> float:
+    params = {"batch_size": BATCH_SIZE, "per_lane": BATCH_SIZE, "per_instance": BATCH_SIZE}
+    timings, server = [], []
+    explain = text(f"EXPLAIN (ANALYZE, TIMING OFF, FORMAT JSON) {statement.text}")
+    for _ in range(RUNS):
+        # cada execução reivindica de verdade e é desfeita, para a fila não esvaziar
+        transaction = await conn.begin_nested()
+        started = time.perf_counter()
+        result = await conn.execute(statement, params)
+        claimed = len(result.all())
+        timings.append((time.perf_counter() - started) * 1000)
+        await transaction.rollback()
+        transaction = await conn.begin_nested()
+        (plan,) = (await conn.execute(explain, params)).scalar_one()
+        server.append(plan["Execution Time"])
+        await transaction.rollback()
+    plan = await conn.execute(text(f"EXPLAIN {statement.text}"), params)
+    nodes = [line for (line,) in plan if "Scan" in line]
+    timings.sort()
+    server.sort()
+    p50 = statistics.median(server)
+    p99 = server[int(len(server) * 0.99) - 1]
+    print(
+        f"{label:<20} lote={claimed:<4} servidor p50={p50:7.3f} ms p99={p99:7.3f} ms"
+        f"  cliente p50={statistics.median(timings):7.3f} ms  {nodes[0].strip() if nodes else ''}"
+    )
+    return p50
+
+async def main() -> int:
+    async with engine.connect() as conn:
+        await conn.begin()
+        print(f"semeando {SENT_ROWS:,} enviadas + {DUE_ROWS:,} vencidas + {FUTURE_ROWS:,} futuras...")
+        await seed(conn)
+        await measure(conn, "busca sem índice", POLL_SQL)
+        await conn.execute(text(
+            f"CREATE INDEX ON messages (instance, coalesce(batch_id, '{NIL_LANE}'::uuid), scheduled_at)"
+            " WHERE status = 'scheduled'"
+        ))
+        await conn.execute(text("ANALYZE messages"))
+        p50 = await measure(conn, "busca", POLL_SQL)
+        await measure(conn, "reivindicação", CLAIM_SQL)
+        await conn.rollback()
+    await engine.dispose()
+    if p50 > BUDGET_MS:
+        print(f"FALHOU: p50 {p50:.3f} ms > {BUDGET_MS} ms")
+        return 1
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(asyncio.run(main()))
@@ -0,0 +1,85 @@
+"""
+Custo de montar e serializar uma página de 200 usuários de /users:
+
+- orm:       entidades User completas + model_renderer (validação Pydantic)
+- rows:      Row projetado (USER_LIST_COLUMNS) + model_renderer
+- rows-fast: Row projetado + rows_renderer (orjson direto das tuplas)
+
+Mede objetos/s e o pico de memória alocada por página (tracemalloc).
+Não usa banco: as linhas são montadas em memória, então o custo de rede
+e do driver fica de fora.
+
+    cd backend && python -m benchmarks.list_rendering
+"""
+import time
+import tracemalloc
+import uuid
+from datetime import datetime, timedelta
+
+from sqlalchemy.engine.result import IteratorResult, SimpleResultMetaData
+
+from src.models.user import User
+from src.schemas.roles_schemas import Roles
+from src.schemas.user_schemas import UserModel
+from src.services.cache_service import model_renderer, rows_renderer
+from src.services.user_service import USER_LIST_COLUMNS
+
+PAGE_SIZE = 200
+ROUNDS = 300
+
+def make_values():
+    institution_id = uuid.uuid4()
+    now = datetime(2025, 1, 1, 12, 0, 0, 123456)
+    return [
+        {
+            "id": uuid.uuid4(),
+            "username": f"user{i}",
+            "email": f"user{i}@example.com",
+            "first_name": "Nome",
+            "last_name": f"Sobrenome {i}",
+            "is_verified": bool(i % 2),
+            "created_at": now - timedelta(minutes=i),
+            "updated_at": now,
+            "role": Roles.user,
+            "institution_id": institution_id,
+        }
+        for i in range(PAGE_SIZE)
+    ]
+
+def main() -> None:
+    values = make_values()
+    keys = [column.key for column in USER_LIST_COLUMNS]
+    tuples = [tuple(v[k] for k in keys) for v in values]
+    metadata = SimpleResultMetaData(keys)
+    password_hash = "$argon2id$v=19$m=65536,t=3,p=4$" + "x" * 64
+
+    render_model = model_renderer(list[UserModel])
+    render_rows = rows_renderer(list[UserModel])
+
+    cases = {
+        "orm": lambda: render_model([User(**v, password_hash=password_hash) for v in values]),
+        "rows": lambda: render_model(IteratorResult(metadata, iter(tuples)).all()),
+        "rows-fast": lambda: render_rows(IteratorResult(metadata, iter(tuples)).all()),
+    }
+
+    outputs = {name: case() for name, case in cases.items()}
+    assert outputs["rows"] == outputs["rows-fast"], "rows_renderer diverge do model_renderer"
+
+    print(f"{'modo':<12}{'ms/página':>12}{'objetos/s':>14}{'pico KiB/página':>18}")
+    for name, case in cases.items():
+        started = time.perf_counter()
+        for _ in range(ROUNDS):
+            case()
+        elapsed = time.perf_counter() - started
+
+        tracemalloc.start()
+        case()
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+
+        per_page_ms = elapsed / ROUNDS * 1000
+        objects_per_sec = PAGE_SIZE * ROUNDS / elapsed
+        print(f"{name:<12}{per_page_ms:>12.3f}{objects_per_sec:>14,.0f}{peak / 1024:>18.1f}")
+
+if __name__ == "__main__":
+    main()
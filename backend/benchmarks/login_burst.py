@@ -0,0 +1,95 @@
+"""
+Carga: p99 de um endpoint não relacionado (/ping) durante uma rajada de
+logins, com o argon2 rodando no event loop (antes) e no pool dedicado
+(depois). Usa um app mínimo via httpx.ASGITransport, sem banco nem Redis.
+
+    cd backend && python -m benchmarks.login_burst  # requer o .env do backend
+"""
+import asyncio
+import math
+import statistics
+import time
+
+import httpx
+from fastapi import FastAPI
+
+from src.core.erros import register_all_errors
+from src.utils.password_verify import (
+    generate_password_hash,
+    verify_password,
+    verify_password_async,
+)
+
+LOGINS = 16
+PING_INTERVAL = 0.005
+
+PASSWORD = "S3nh@Forte!"
+HASH = generate_password_hash(PASSWORD)
+
+app = FastAPI()
+register_all_errors(app)
+
+@app.post("/login-inline")
+async def login_inline():
+    return {"ok": verify_password(password=PASSWORD, hash=HASH)}
+
+@app.post("/login-pool")
+async def login_pool():
+    return {"ok": await verify_password_async(password=PASSWORD, hash=HASH)}
+
+@app.get("/ping")
+async def ping():
+    return {"pong": True}
+
+async def burst(client: httpx.AsyncClient, login_path: str) -> None:
+    latencies = []
+    statuses = {}
+
+    async def login() -> None:
+        resp = await client.post(login_path)
+        statuses[resp.status_code] = statuses.get(resp.status_code, 0) + 1
+
+    done = asyncio.Event()
+
+    async def probe(scheduled_at: float) -> None:
+        await client.get("/ping")
+        latencies.append(time.perf_counter() - scheduled_at)
+
+    async def pinger() -> None:
+        # um /ping a cada PING_INTERVAL, medido a partir do instante agendado:
+        # com o loop bloqueado, os atrasados saem juntos depois e contam a espera,
+        # em vez de simplesmente não existirem
+        probes = []
+        first = time.perf_counter()
+        while not done.is_set():
+            scheduled_at = first + len(probes) * PING_INTERVAL
+            await asyncio.sleep(max(0.0, scheduled_at - time.perf_counter()))
+            probes.append(asyncio.create_task(probe(scheduled_at)))
+        await asyncio.gather(*probes)
+
+    async def logins() -> None:
+        await asyncio.sleep(PING_INTERVAL * 10)
+        await asyncio.gather(*(login() for _ in range(LOGINS)))
+        await asyncio.sleep(PING_INTERVAL * 10)
+        done.set()
+
+    started = time.perf_counter()
+    await asyncio.gather(pinger(), logins())
+    elapsed = time.perf_counter() - started
+    latencies.sort()
+    p50 = statistics.median(latencies) * 1000
+    # nearest-rank: com poucas amostras, int(n * 0.99) - 1 cairia uma posição abaixo
+    p99 = latencies[math.ceil(len(latencies) * 0.99) - 1] * 1000
+    print(
+        f"{login_path:<14} /ping n={len(latencies):<5} p50={p50:8.2f} ms  p99={p99:8.2f} ms  "
+        f"max={latencies[-1] * 1000:8.2f} ms  total={elapsed:5.2f} s  logins={statuses}"
+    )
+
+async def main() -> None:
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+        await burst(client, "/login-inline")
+        await burst(client, "/login-pool")
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,63 @@
+"""
+Pico de memória (tracemalloc) por upload em /file, por tamanho de arquivo:
+
+- read():  await file.read() inteiro, como antes (bytes indo para o LargeBinary)
+- stream:  stream_upload em pedaços de MEDIA_CHUNK_SIZE para o LocalBlobStore
+
+O arquivo vem de um SpooledTemporaryFile já em disco, como o Starlette
+entrega uploads grandes. Não usa banco.
+
+    cd backend && python -m benchmarks.media_upload
+"""
+import asyncio
+import os
+import tempfile
+import time
+import tracemalloc
+
+from fastapi import UploadFile
+
+from src.core.config import get_settings
+from src.services.blob_store import LocalBlobStore, stream_upload
+
+SIZES_MB = (1, 5, 10, 50)
+
+def make_upload(size: int) -> UploadFile:
+    spooled = tempfile.SpooledTemporaryFile(max_size=1024 * 1024)
+    block = os.urandom(1024 * 1024)
+    for _ in range(size // len(block)):
+        spooled.write(block)
+    spooled.seek(0)
+    return UploadFile(file=spooled, filename="arquivo.bin", size=size)
+
+async def measure(func) -> tuple:
+    tracemalloc.start()
+    started = time.perf_counter()
+    await func()
+    elapsed = time.perf_counter() - started
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return peak, elapsed
+
+async def main() -> None:
+    chunk_size = get_settings().MEDIA_CHUNK_SIZE
+    with tempfile.TemporaryDirectory() as root:
+        store = LocalBlobStore(root)
+        print(f"{'MB':>4}{'read() pico KiB':>18}{'stream pico KiB':>18}{'stream ms':>12}")
+        for size_mb in SIZES_MB:
+            size = size_mb * 1024 * 1024
+
+            upload = make_upload(size)
+            read_peak, _ = await measure(upload.read)
+            await upload.close()
+
+            upload = make_upload(size)
+            stream_peak, stream_elapsed = await measure(
+                lambda: stream_upload(upload, store, None, chunk_size=chunk_size, max_bytes=size)
+            )
+            await upload.close()
+
+            print(f"{size_mb:>4}{read_peak / 1024:>18,.0f}{stream_peak / 1024:>18,.0f}{stream_elapsed * 1000:>12.1f}")
+
+if __name__ == "__main__":
+    asyncio.run(main())
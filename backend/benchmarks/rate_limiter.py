@@ -0,0 +1,75 @@
+"""
+Compara o RateLimiter GCRA (script Lua, 1 round-trip) com o limiter
+anterior baseado em sorted set (pipeline de 4 comandos + ZREM ao rejeitar).
+
+Precisa de um Redis real (usa REDIS_HOST/REDIS_PORT/REDIS_PASSWORD do .env):
+
+    cd backend && python -m benchmarks.rate_limiter
+"""
+import asyncio
+import time
+from uuid import uuid4
+
+from redis.asyncio import Redis
+
+from src.core.config import get_settings
+from src.core.middleware import RateLimiter
+
+REQUESTS = 5_000
+CONCURRENCY = 50
+
+class SortedSetRateLimiter:
+    """Implementação anterior, mantida aqui só para comparação."""
+    def __init__(self, redis_client: Redis, max_requests=10, window=60):
+        self.redis = redis_client
+        self.max_requests = max_requests
+        self.window = window
+
+    async def allow_request(self, user_id) -> bool:
+        now = time.time()
+        key = f"rate_limit:{user_id}"
+        member = f"{now}-{uuid4()}"
+        pipe = self.redis.pipeline()
+        pipe.zadd(key, {member: now})
+        pipe.zremrangebyscore(key, 0, now - self.window)
+        pipe.zcard(key)
+        pipe.expire(key, int(self.window * 2))
+        _, _, request_count, _ = await pipe.execute()
+        allowed = request_count <= self.max_requests
+        if not allowed:
+            await self.redis.zrem(key, member)
+        return allowed
+
+async def run(label: str, limiter, redis_client: Redis, key: str, memory_key: str) -> None:
+    semaphore = asyncio.Semaphore(CONCURRENCY)
+    allowed = 0
+
+    async def one() -> None:
+        nonlocal allowed
+        async with semaphore:
+            if await limiter.allow_request(key):
+                allowed += 1
+
+    started = time.perf_counter()
+    await asyncio.gather(*(one() for _ in range(REQUESTS)))
+    elapsed = time.perf_counter() - started
+    memory = await redis_client.memory_usage(memory_key)
+    print(
+        f"{label:<12} {REQUESTS / elapsed:>10.0f} req/s  "
+        f"{elapsed / REQUESTS * 1e6:>8.1f} µs/req  permitidas={allowed:<6} memória={memory} bytes"
+    )
+    await redis_client.delete(memory_key)
+
+async def main() -> None:
+    settings = get_settings()
+    redis_client = Redis(host=settings.REDIS_HOST, port=settings.REDIS_PORT, password=settings.REDIS_PASSWORD)
+    # limite alto para que o sorted set cresça como em tráfego real
+    max_requests, window = 1_000, 60
+    key = f"bench:{uuid4().hex}"
+
+    await run("sorted set", SortedSetRateLimiter(redis_client, max_requests, window), redis_client, key, f"rate_limit:{key}")
+    await run("gcra", RateLimiter(redis_client, max_requests, window), redis_client, key, f"rate_limit:gcra:{key}")
+    await redis_client.aclose()
+
+if __name__ == "__main__":
+    asyncio.run(main())
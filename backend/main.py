@@ -7,6 +7,8 @@ from src.routers.login import login_router
 from src.routers.users import user_router
 from src.routers.auth import auth_router
 from src.routers.evo import evo_router
+from src.routers.metrics import metrics_router
+from src.routers.messages import messages_router
 import uvicorn
 from src.routers.config import AllRoutersConfiguration
 from contextlib import asynccontextmanager
@@ -17,15 +19,29 @@ from src.db.database import engine
 import logging
 import structlog
 from src.core.erros import register_all_errors
+from src.core.middleware import RateLimitHeadersMiddleware
+from src.services.evolution_service import start_http_client, close_http_client
+from src.services.cache_service import local_cache, listen_for_invalidations
+from src.services.message_dispatcher import build_dispatcher
+from src.db.redis import redis_client, sync_blocklist
+from src.utils.password_verify import password_pool
+import asyncio
+import contextlib
 
-logging.basicConfig(level=logging.ERROR, format="%(message)s")
+LOG_LEVEL = logging.getLevelNamesMapping().get(get_settings().LOG_LEVEL.upper(), logging.ERROR)
+
+logging.basicConfig(level=LOG_LEVEL, format="%(message)s")
 file_handler = logging.FileHandler("app.log")
 file_handler.setLevel(logging.ERROR)
 logging.getLogger().addHandler(file_handler)
 
+# Chamadas abaixo de LOG_LEVEL viram no-op no próprio bound logger,
+# sem passar pelos processors nem pelo logging da stdlib.
 structlog.configure(
     processors=[structlog.processors.JSONRenderer()],
     logger_factory=structlog.stdlib.LoggerFactory(),
+    wrapper_class=structlog.make_filtering_bound_logger(LOG_LEVEL),
+    cache_logger_on_first_use=True,
 )
 logger = structlog.get_logger()
 
@@ -33,8 +49,20 @@ logger = structlog.get_logger()
 async def lifespan(app: FastAPI):
     """Application lifespan events"""
     logger.info("Starting Wazzy Platform")
-    
+    await start_http_client()
+    background_tasks = [asyncio.create_task(sync_blocklist())]
+    if local_cache is not None:
+        background_tasks.append(asyncio.create_task(listen_for_invalidations(redis_client, local_cache)))
+    if get_settings().DISPATCHER_ENABLED:
+        background_tasks.append(asyncio.create_task(build_dispatcher().run()))
+
     yield
+    for task in background_tasks:
+        task.cancel()
+        with contextlib.suppress(asyncio.CancelledError):
+            await task
+    await close_http_client()
+    password_pool.shutdown()
     await engine.dispose()
 
     logger.info("Shutting down Wazzy Platform")
@@ -54,10 +82,14 @@ AllRoutersConfiguration(
         login_router,
         user_router,
         auth_router,
-        evo_router
+        evo_router,
+        metrics_router,
+        messages_router
     ]
 )
 
+app.add_middleware(RateLimitHeadersMiddleware)
+
 app.add_middleware(
     CORSMiddleware,
     allow_origins=get_settings().ALLOWED_ORIGINS,
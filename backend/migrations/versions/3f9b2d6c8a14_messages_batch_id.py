@@ -0,0 +1,32 @@
+"""messages batch id
+
+Revision ID: 3f9b2d6c8a14
+Revises: e2a94c7b3d58
+Create Date: 2026-10-18 19:21:40.386517
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '3f9b2d6c8a14'
+down_revision: Union[str, Sequence[str], None] = 'e2a94c7b3d58'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # coluna nula: ADD COLUMN sem reescrever a tabela
+    op.add_column('messages', sa.Column('batch_id', sa.UUID(), nullable=True))
+    with op.get_context().autocommit_block():
+        op.create_index(op.f('ix_messages_batch_id'), 'messages', ['batch_id'], unique=False, postgresql_concurrently=True)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index(op.f('ix_messages_batch_id'), table_name='messages')
+    op.drop_column('messages', 'batch_id')
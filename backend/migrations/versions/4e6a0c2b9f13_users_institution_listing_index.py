@@ -0,0 +1,37 @@
+"""users institution listing index
+
+Revision ID: 4e6a0c2b9f13
+Revises: df19e98edad0
+Create Date: 2026-10-18 11:02:47.918342
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '4e6a0c2b9f13'
+down_revision: Union[str, Sequence[str], None] = 'df19e98edad0'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # GET /users: WHERE institution_id = ? ORDER BY created_at DESC, id DESC sem sort
+    with op.get_context().autocommit_block():
+        op.create_index(
+            'ix_users_institution_created_at_id',
+            'users',
+            ['institution_id', sa.text('created_at DESC'), sa.text('id DESC')],
+            unique=False,
+            postgresql_concurrently=True,
+        )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.get_context().autocommit_block():
+        op.drop_index('ix_users_institution_created_at_id', table_name='users', postgresql_concurrently=True)
@@ -0,0 +1,31 @@
+"""drop users institution_id index
+
+Revision ID: 6d2e8f1a4c37
+Revises: 3f9b2d6c8a14
+Create Date: 2026-10-18 20:04:12.530218
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '6d2e8f1a4c37'
+down_revision: Union[str, Sequence[str], None] = '3f9b2d6c8a14'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # ix_users_institution_created_at_id começa por institution_id e já atende essas buscas
+    with op.get_context().autocommit_block():
+        op.drop_index(op.f('ix_users_institution_id'), table_name='users', postgresql_concurrently=True, if_exists=True)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.get_context().autocommit_block():
+        op.create_index(op.f('ix_users_institution_id'), 'users', ['institution_id'], unique=False, postgresql_concurrently=True)
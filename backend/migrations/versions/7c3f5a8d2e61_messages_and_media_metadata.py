@@ -0,0 +1,110 @@
+"""messages and media metadata
+
+Revision ID: 7c3f5a8d2e61
+Revises: 4e6a0c2b9f13
+Create Date: 2026-10-18 14:37:05.512904
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '7c3f5a8d2e61'
+down_revision: Union[str, Sequence[str], None] = '4e6a0c2b9f13'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    inspector = sa.inspect(op.get_bind())
+    tables = inspector.get_table_names()
+
+    if 'messages' not in tables:
+        op.create_table('messages',
+        sa.Column('id', sa.UUID(), nullable=False),
+        sa.Column('jid', sa.String(), nullable=False),
+        sa.Column('instance', sa.String(), nullable=False),
+        sa.Column('content', sa.String(), nullable=False),
+        sa.Column('media', sa.Boolean(), nullable=False),
+        sa.Column('scheduled_at', sa.DateTime(timezone=True), nullable=False),
+        sa.Column('status', sa.String(length=20), nullable=False),
+        sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=False),
+        sa.Column('updated_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=False),
+        sa.Column('sent_at', sa.DateTime(timezone=True), nullable=True),
+        sa.Column('error', sa.Text(), nullable=True),
+        sa.PrimaryKeyConstraint('id')
+        )
+        op.create_index(op.f('ix_messages_jid'), 'messages', ['jid'], unique=False)
+    else:
+        # tabela criada antes via create_all: sent_at/error nascem vazios
+        op.alter_column('messages', 'sent_at', nullable=True)
+        op.alter_column('messages', 'error', nullable=True)
+
+    if 'message_media' not in tables:
+        op.create_table('message_media',
+        sa.Column('id', sa.UUID(), nullable=False),
+        sa.Column('media_name', sa.String(), nullable=False),
+        sa.Column('media_type', sa.Enum('image', 'document', name='media_type_enum'), nullable=False),
+        sa.Column('content_type', sa.String(length=255), nullable=True),
+        sa.Column('size_bytes', sa.BigInteger(), nullable=False),
+        sa.Column('sha256', sa.String(length=64), nullable=False),
+        sa.Column('storage', sa.String(length=20), nullable=False),
+        sa.Column('storage_key', sa.String(), nullable=False),
+        sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=False),
+        sa.PrimaryKeyConstraint('id')
+        )
+    else:
+        # move o conteúdo de media_data (bytea) para large objects e mantém só os metadados
+        op.add_column('message_media', sa.Column('content_type', sa.String(length=255), nullable=True))
+        op.add_column('message_media', sa.Column('size_bytes', sa.BigInteger(), nullable=True))
+        op.add_column('message_media', sa.Column('sha256', sa.String(length=64), nullable=True))
+        op.add_column('message_media', sa.Column('storage', sa.String(length=20), nullable=True))
+        op.add_column('message_media', sa.Column('storage_key', sa.String(), nullable=True))
+        op.add_column('message_media', sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=False))
+        op.execute(
+            "UPDATE message_media SET "
+            "size_bytes = octet_length(media_data), "
+            "sha256 = encode(sha256(media_data), 'hex'), "
+            "storage = 'postgres', "
+            "storage_key = lo_from_bytea(0, media_data)::text"
+        )
+        for column in ('size_bytes', 'sha256', 'storage', 'storage_key'):
+            op.alter_column('message_media', column, nullable=False)
+        op.drop_column('message_media', 'media_data')
+    op.create_index(op.f('ix_message_media_sha256'), 'message_media', ['sha256'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    # O upgrade não deixa rastro de qual caminho seguiu, então o downgrade decide
+    # pelos dados: tabela com linhas é tratada como preexistente e volta ao formato
+    # antigo (media_data em bytea) em vez de ser apagada; tabela vazia é removida.
+    bind = op.get_bind()
+    op.drop_index(op.f('ix_message_media_sha256'), table_name='message_media')
+
+    if bind.execute(sa.text("SELECT EXISTS (SELECT 1 FROM message_media)")).scalar():
+        if bind.execute(sa.text("SELECT EXISTS (SELECT 1 FROM message_media WHERE storage <> 'postgres')")).scalar():
+            raise RuntimeError(
+                "Downgrade irreversível: há mídias fora do Postgres (storage <> 'postgres') "
+                "que não cabem de volta em media_data."
+            )
+        op.add_column('message_media', sa.Column('media_data', sa.LargeBinary(), nullable=True))
+        op.execute("UPDATE message_media SET media_data = lo_get(storage_key::oid)")
+        # uploads iguais podem dividir o mesmo large object
+        op.execute("SELECT lo_unlink(oid) FROM (SELECT DISTINCT storage_key::oid AS oid FROM message_media) AS blobs")
+        op.alter_column('message_media', 'media_data', nullable=False)
+        for column in ('content_type', 'size_bytes', 'sha256', 'storage', 'storage_key', 'created_at'):
+            op.drop_column('message_media', column)
+    else:
+        op.drop_table('message_media')
+        sa.Enum(name='media_type_enum').drop(bind, checkfirst=True)
+
+    # sent_at/error continuam aceitando NULL: voltar a NOT NULL falharia nas
+    # mensagens ainda não enviadas
+    if not bind.execute(sa.text("SELECT EXISTS (SELECT 1 FROM messages)")).scalar():
+        op.drop_index(op.f('ix_messages_jid'), table_name='messages')
+        op.drop_table('messages')
@@ -0,0 +1,29 @@
+"""messages attempts
+
+Revision ID: 8a1c5e3f7b20
+Revises: 6d2e8f1a4c37
+Create Date: 2026-10-18 20:21:53.104877
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '8a1c5e3f7b20'
+down_revision: Union[str, Sequence[str], None] = '6d2e8f1a4c37'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # default constante: ADD COLUMN sem reescrever a tabela
+    op.add_column('messages', sa.Column('attempts', sa.Integer(), server_default='0', nullable=False))
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_column('messages', 'attempts')
@@ -0,0 +1,48 @@
+"""messages due queue indexes
+
+Revision ID: b5d81e4f07a2
+Revises: 7c3f5a8d2e61
+Create Date: 2026-10-18 16:05:12.730146
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'b5d81e4f07a2'
+down_revision: Union[str, Sequence[str], None] = '7c3f5a8d2e61'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Índices parciais: mensagens já enviadas não entram, então o tamanho
+    # acompanha a fila e não o histórico
+    with op.get_context().autocommit_block():
+        op.create_index(
+            'ix_messages_due',
+            'messages',
+            ['scheduled_at'],
+            unique=False,
+            postgresql_where=sa.text("status = 'scheduled'"),
+            postgresql_concurrently=True,
+        )
+        op.create_index(
+            'ix_messages_sending',
+            'messages',
+            ['updated_at'],
+            unique=False,
+            postgresql_where=sa.text("status = 'sending'"),
+            postgresql_concurrently=True,
+        )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.get_context().autocommit_block():
+        op.drop_index('ix_messages_sending', table_name='messages', postgresql_concurrently=True)
+        op.drop_index('ix_messages_due', table_name='messages', postgresql_concurrently=True)
@@ -0,0 +1,50 @@
+"""messages due lane index replaces ix_messages_due
+
+Revision ID: c4f7a9e2d615
+Revises: 8a1c5e3f7b20
+Create Date: 2026-10-18 20:47:09.381526
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c4f7a9e2d615'
+down_revision: Union[str, Sequence[str], None] = '8a1c5e3f7b20'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Lanes (instância, lote) da fila para o CLAIM_SQL do dispatcher: skip scan
+    # das lanes e as vencidas mais antigas de cada uma. Avulsas (batch_id nulo)
+    # ficam na lane nil, para a comparação de tuplas não esbarrar em NULL.
+    # Substitui o ix_messages_due, que o CLAIM_SQL não usa mais.
+    with op.get_context().autocommit_block():
+        op.create_index(
+            'ix_messages_due_lane',
+            'messages',
+            ['instance', sa.text("coalesce(batch_id, '00000000-0000-0000-0000-000000000000'::uuid)"), 'scheduled_at'],
+            unique=False,
+            postgresql_where=sa.text("status = 'scheduled'"),
+            postgresql_concurrently=True,
+        )
+        op.drop_index('ix_messages_due', table_name='messages', postgresql_concurrently=True)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.get_context().autocommit_block():
+        op.create_index(
+            'ix_messages_due',
+            'messages',
+            ['scheduled_at'],
+            unique=False,
+            postgresql_where=sa.text("status = 'scheduled'"),
+            postgresql_concurrently=True,
+        )
+        op.drop_index('ix_messages_due_lane', table_name='messages', postgresql_concurrently=True)
@@ -0,0 +1,37 @@
+"""institution keyset index
+
+Revision ID: df19e98edad0
+Revises: a931f7ed68b8
+Create Date: 2026-10-18 10:12:31.204518
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'df19e98edad0'
+down_revision: Union[str, Sequence[str], None] = 'a931f7ed68b8'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Paginação por cursor em (created_at, id); CONCURRENTLY para não bloquear escritas
+    with op.get_context().autocommit_block():
+        op.create_index(
+            'ix_institution_created_at_id',
+            'institution',
+            ['created_at', 'id'],
+            unique=False,
+            postgresql_concurrently=True,
+        )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.get_context().autocommit_block():
+        op.drop_index('ix_institution_created_at_id', table_name='institution', postgresql_concurrently=True)
@@ -0,0 +1,63 @@
+"""messages due notify trigger
+
+Revision ID: e2a94c7b3d58
+Revises: b5d81e4f07a2
+Create Date: 2026-10-18 17:48:22.061873
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e2a94c7b3d58'
+down_revision: Union[str, Sequence[str], None] = 'b5d81e4f07a2'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Um NOTIFY por comando (não por linha), com os segundos até o
+    # scheduled_at mais próximo entre as linhas agendadas pelo comando.
+    # Inserções em lote (COPY, INSERT ... SELECT) geram uma notificação só.
+    op.execute("""
+        CREATE OR REPLACE FUNCTION messages_notify_due() RETURNS trigger AS $$
+        DECLARE
+            next_due timestamptz;
+        BEGIN
+            SELECT min(scheduled_at) INTO next_due
+              FROM new_rows
+             WHERE status = 'scheduled';
+            IF next_due IS NOT NULL THEN
+                PERFORM pg_notify(
+                    'messages_due',
+                    greatest(extract(epoch FROM next_due - clock_timestamp()), 0)::text
+                );
+            END IF;
+            RETURN NULL;
+        END;
+        $$ LANGUAGE plpgsql;
+    """)
+    # tabelas de transição não aceitam UPDATE OF <colunas>: um trigger por evento
+    op.execute("""
+        CREATE TRIGGER messages_notify_due_insert
+        AFTER INSERT ON messages
+        REFERENCING NEW TABLE AS new_rows
+        FOR EACH STATEMENT EXECUTE FUNCTION messages_notify_due();
+    """)
+    op.execute("""
+        CREATE TRIGGER messages_notify_due_update
+        AFTER UPDATE ON messages
+        REFERENCING NEW TABLE AS new_rows
+        FOR EACH STATEMENT EXECUTE FUNCTION messages_notify_due();
+    """)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.execute("DROP TRIGGER IF EXISTS messages_notify_due_update ON messages;")
+    op.execute("DROP TRIGGER IF EXISTS messages_notify_due_insert ON messages;")
+    op.execute("DROP FUNCTION IF EXISTS messages_notify_due();")
@@ -1,13 +1,16 @@
 from pydantic_settings import BaseSettings, SettingsConfigDict
 from pydantic import field_validator
-from typing import List
+from typing import List, Optional
 from functools import lru_cache
 
 class Settings(BaseSettings):
     API_PREFIX: str
     API_VERSION: str
     DEBUG: bool
+    LOG_LEVEL: str = "ERROR"
     SQLALCHEMY_DATABASE_URL: str
+    SQLALCHEMY_READ_DATABASE_URL: Optional[str] = None
+    DB_READ_STICKY_SECONDS: float = 5.0
     ALLOWED_ORIGINS: str
     JWT_SECRET: str
     JWT_ALGORITHM: str
@@ -23,6 +26,50 @@ class Settings(BaseSettings):
     MAIL_FROM_NAME: str
     MAIL_FROM: str
     BACKEND_PORT: int
+    EVO_HTTP_TIMEOUT: float = 30.0
+    EVO_HTTP_MAX_CONNECTIONS: int = 100
+    EVO_HTTP_MAX_KEEPALIVE_CONNECTIONS: int = 20
+    EVO_HTTP_KEEPALIVE_EXPIRY: float = 30.0
+    EVO_HTTP2: bool = True
+    EVO_INSTANCES_TTL: int = 30
+    CACHE_LOCAL_ENABLED: bool = True
+    CACHE_LOCAL_MAX_ENTRIES: int = 1024
+    CACHE_CODEC: str = "json"
+    RATE_LIMIT_LOCAL_PRECHECK: bool = True
+    PRINCIPAL_CACHE_TTL: int = 60
+    PASSWORD_HASH_WORKERS: int = 2
+    PASSWORD_HASH_MAX_PENDING: int = 16
+    ARGON2_TIME_COST: Optional[int] = None
+    ARGON2_MEMORY_COST: Optional[int] = None
+    ARGON2_PARALLELISM: Optional[int] = None
+    DB_POOL_SIZE: int = 10
+    DB_MAX_OVERFLOW: int = 10
+    DB_POOL_TIMEOUT: float = 10.0
+    DB_POOL_RECYCLE: int = 1800
+    DB_POOL_PRE_PING: bool = True
+    DB_STATEMENT_CACHE_SIZE: int = 100
+    DB_COMMAND_TIMEOUT: Optional[float] = 30.0
+    DB_APPLICATION_NAME: str = "fastapi-backend"
+    MEDIA_STORE: str = "local"
+    MEDIA_LOCAL_ROOT: str = "media"
+    MEDIA_CHUNK_SIZE: int = 256 * 1024
+    DISPATCHER_ENABLED: bool = False
+    DISPATCHER_BATCH_SIZE: int = 50
+    DISPATCHER_MAX_BATCHES: int = 4
+    DISPATCHER_CLAIM_PER_INSTANCE: Optional[int] = None
+    DISPATCHER_POLL_INTERVAL: float = 1.0
+    DISPATCHER_LEASE_SECONDS: int = 300
+    DISPATCHER_LISTEN: bool = True
+    DISPATCHER_IDLE_POLL_INTERVAL: float = 30.0
+    DISPATCHER_MAX_ATTEMPTS: int = 5
+    DISPATCHER_RETRY_BACKOFF: float = 30.0
+    DISPATCHER_RETRY_BACKOFF_MAX: float = 3600.0
+    SEND_RATE_PER_SECOND: float = 1.0
+    SEND_BURST: int = 5
+    SEND_MAX_IN_FLIGHT: int = 2
+    SEND_SLOT_TTL: float = 60.0
+    BULK_SCHEDULE_MAX_ROWS: int = 100_000
+    BULK_SCHEDULE_MAX_BYTES: int = 32 * 1024 * 1024
 
     @property
     def SYNC_DB_URL(self) -> str:
@@ -2,14 +2,14 @@ from fastapi.security import HTTPBearer
 from fastapi import Request, status, Depends, Query
 from fastapi.exceptions import HTTPException
 from fastapi.security.http import HTTPAuthorizationCredentials
-from typing import Any, Dict, List
-from sqlalchemy.ext.asyncio import AsyncSession
-from src.db.database import get_db
+from typing import Any, Callable, Dict, List, Optional
+from src.db.database import open_read_session
 from src.services.user_service import UserService
 from src.utils.token_auth import decode_token
 from src.db.redis import token_in_blocklist, redis_client
 from src.models.user import User
 from src.services.evolution_service import EvolutionService
+from src.services.instance_registry import InstanceRegistry
 from src.core.config import get_settings
 import time
 from redis.asyncio import Redis
@@ -17,7 +17,10 @@ from fastapi.responses import JSONResponse
 from uuid import UUID
 from src.db.redis import redis_client
 from src.core.config import get_settings
-from src.core.middleware import RateLimiter
+from src.services.cache_service import CacheService, local_cache, user_tag, institution_tag
+from src.schemas.user_schemas import CurrentUserModel
+from src.core.middleware import RateLimiter, RateLimitPolicy, RateLimitResult, LocalTokenBucket
+import math
 from src.core.erros import (
     InvalidToken,
     RefreshTokenRequired,
@@ -28,8 +31,9 @@ from src.core.erros import (
     UserNotFound
 )
 
-rate_limiter = RateLimiter(redis_client=redis_client)
 user_service = UserService()
+principal_cache = CacheService(redis_client=redis_client, local_cache=local_cache)
+instance_registry = InstanceRegistry(redis_client=redis_client, ttl=get_settings().EVO_INSTANCES_TTL)
 
 class TokenBearer(HTTPBearer):
     def __init__(self, auto_error: bool = True):
@@ -67,21 +71,85 @@ class RefreshTokenBearer(TokenBearer):
         if token_data.get("refresh") is not True:
             raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Please, provide a refresh token")
         
-async def get_current_user(token_details: dict = Depends(AccessTokenBearer()), session: AsyncSession = Depends(get_db)):
-    user_email = token_details['user']['email']
-    user = await user_service.get_user_by_email(email=user_email, session=session)
-    if not user:
-        raise HTTPException(
-            status_code=status.HTTP_401_UNAUTHORIZED,
-            detail="User not found",
-        )
-    return user
+async def get_current_user(
+    request: Request,
+    token_details: dict = Depends(AccessTokenBearer()),
+) -> CurrentUserModel:
+    """
+    Carrega o usuário do token uma única vez por requisição (request.state)
+    e, entre requisições, a partir do cache de principal (L1 + Redis),
+    invalidado pela tag user:<id> em update_profile/delete_user. Na falta
+    do cache, lê da réplica, ou do primário se user:<id> teve escrita recente.
+    """
+    current_user = getattr(request.state, "current_user", None)
+    if current_user is not None:
+        return current_user
+
+    user_uid = (token_details.get("user") or {}).get("user_uid")
+    if not user_uid:
+        raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Invalid token")
+
+    async def load_principal() -> CurrentUserModel:
+        async with await open_read_session([user_tag(user_uid)]) as session:
+            user = await user_service.get_user(user_uid=user_uid, session=session)
+            if not user:
+                raise HTTPException(
+                    status_code=status.HTTP_401_UNAUTHORIZED,
+                    detail="User not found",
+                )
+            return CurrentUserModel.model_validate(user, from_attributes=True)
+
+    data = await principal_cache.get_or_load(
+        f"principal:{user_uid}",
+        load_principal,
+        timeout=get_settings().PRINCIPAL_CACHE_TTL,
+        key_prefix="principal",
+        tags=[user_tag(user_uid)],
+    )
+    current_user = data if isinstance(data, CurrentUserModel) else CurrentUserModel.model_validate(data)
+    request.state.current_user = current_user
+    return current_user
+
+def _read_scopes(current_user: CurrentUserModel) -> List[str]:
+    scopes = [user_tag(current_user.id)]
+    if current_user.institution_id is not None:
+        scopes.append(institution_tag(current_user.institution_id))
+    return scopes
+
+def read_db(scopes: Callable[[CurrentUserModel], List[str]] = _read_scopes):
+    """
+    Dependência de sessão para consultas somente leitura (listagens). Vai
+    para a réplica, exceto quando algum dos escopos lidos (scopes) teve
+    escrita nos últimos DB_READ_STICKY_SECONDS.
+    """
+    async def dependency(current_user: CurrentUserModel = Depends(get_current_user)):
+        db = await open_read_session(scopes(current_user))
+        try:
+            yield db
+        finally:
+            await db.close()
+    return dependency
+
+# listagens da instituição do usuário (/users)
+get_read_db = read_db()
+
+async def get_unscoped_read_db():
+    """
+    Sessão de leitura sem usuário autenticado (login): sempre a réplica
+    quando configurada, sem escopos de read-your-writes; o atraso dela é
+    aceitável ali.
+    """
+    db = await open_read_session()
+    try:
+        yield db
+    finally:
+        await db.close()
 
 class RoleChecker:
     def __init__(self, allowed_roles: List[str]) -> None:
         self.allowed_roles = allowed_roles
 
-    def __call__(self, current_user: User = Depends(get_current_user)) -> Any:
+    def __call__(self, current_user: CurrentUserModel = Depends(get_current_user)) -> Any:
         if current_user.role in self.allowed_roles:
             return True
         raise HTTPException(
@@ -101,26 +169,75 @@ async def ensure_instance_exists(
     instance: str = Query(..., description="Nome da instância"),
     evo: EvolutionService = Depends(EvolutionService),
 ) -> str:
-    instances = await evo.fetch_instances()
-    names = {i.name for i in instances if i.name}
-    if instance not in names:
+    if not await instance_registry.exists(instance, evo):
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail=f"Instância '{instance}' não encontrada"
         )
     return instance
 
-async def rate_limit_dep(
-    request: Request,
-    token_data: dict = Depends(AccessTokenBearer()),
+def _rate_limit_headers(result: RateLimitResult) -> Dict[str, str]:
+    headers = {
+        "X-RateLimit-Limit": str(result.limit),
+        "X-RateLimit-Remaining": str(max(result.remaining, 0)),
+        "X-RateLimit-Reset": str(math.ceil(result.reset_after)),
+    }
+    if not result.allowed:
+        headers["Retry-After"] = str(max(math.ceil(result.retry_after), 1))
+    return headers
+
+def rate_limit(
+    scope: str,
+    default: RateLimitPolicy,
+    per_role: Optional[Dict[str, RateLimitPolicy]] = None,
 ):
-    user = token_data.get("user") or {}
-    user_uid = user.get("user_uid")
-    if not user_uid:
-        raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED,
-                            detail="Invalid token")
-    key = f"rl:user:{user_uid}"
-    allowed = await rate_limiter.allow_request(key)
-    if not allowed:
-        raise HTTPException(status_code=status.HTTP_429_TOO_MANY_REQUESTS,
-                            detail="Limite de requisições excedido")
\ No newline at end of file
+    """
+    Cria uma dependência de rate limit com política por rota (scope) e por
+    role do token. Um token bucket local rejeita rajadas óbvias antes de ir
+    ao Redis; as respostas levam os headers X-RateLimit-* e Retry-After.
+    """
+    policies = dict(per_role or {})
+    limiters = {
+        policy: RateLimiter(redis_client=redis_client, max_requests=policy.max_requests, window=policy.window)
+        for policy in {default, *policies.values()}
+    }
+    buckets = {
+        policy: LocalTokenBucket(capacity=policy.max_requests, refill_per_second=policy.max_requests / policy.window)
+        for policy in limiters
+    } if get_settings().RATE_LIMIT_LOCAL_PRECHECK else {}
+
+    async def dependency(
+        request: Request,
+        token_data: dict = Depends(AccessTokenBearer()),
+    ) -> None:
+        user = token_data.get("user") or {}
+        user_uid = user.get("user_uid")
+        if not user_uid:
+            raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED,
+                                detail="Invalid token")
+        policy = policies.get(user.get("role"), default)
+        key = f"rl:{scope}:user:{user_uid}"
+
+        bucket = buckets.get(policy)
+        if bucket is not None:
+            wait = bucket.try_acquire(key)
+            if wait:
+                result = RateLimitResult(False, policy.max_requests, 0, wait, policy.window)
+                raise HTTPException(status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+                                    detail="Limite de requisições excedido",
+                                    headers=_rate_limit_headers(result))
+
+        result = await limiters[policy].check(key)
+        if not result.allowed:
+            if bucket is not None:
+                bucket.refund(key)
+            raise HTTPException(status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+                                detail="Limite de requisições excedido",
+                                headers=_rate_limit_headers(result))
+        # aplicados na resposta pelo RateLimitHeadersMiddleware (inclusive
+        # quando a rota devolve um Response pronto, ex.: hits de cache)
+        request.state.rate_limit_headers = _rate_limit_headers(result)
+
+    return dependency
+
+rate_limit_dep = rate_limit("default", RateLimitPolicy(max_requests=10, window=60))
@@ -21,6 +21,9 @@ class InvalidJTI(BooklyException): ...
 class UserDeleteConflictError(BooklyException): ...
 class UserCreateError(BooklyException): ...
 class InvalidTokenError(BooklyException): ...
+class PasswordHashingUnavailable(BooklyException): ...
+class InvalidCursor(BooklyException): ...
+class MediaTooLarge(BooklyException): ...
 class AccountNotVerified(BooklyException):
     """Account not yet verified"""
     pass
@@ -133,6 +136,31 @@ def register_all_errors(app: FastAPI):
         ),
     )
 
+    app.add_exception_handler(
+        PasswordHashingUnavailable,
+        create_exception_handler(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            initial_detail={"message": "Server is busy, please try again shortly", "error_code": "password_hashing_busy"},
+            headers={"Retry-After": "1"},
+        ),
+    )
+
+    app.add_exception_handler(
+        InvalidCursor,
+        create_exception_handler(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            initial_detail={"message": "Invalid pagination cursor", "error_code": "invalid_cursor"},
+        ),
+    )
+
+    app.add_exception_handler(
+        MediaTooLarge,
+        create_exception_handler(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            initial_detail={"message": "File exceeds the 10 MB limit", "error_code": "file_too_large"},
+        ),
+    )
+
     @app.exception_handler(Exception)
     async def unhandled_exception_handler(request: Request, exc: Exception):
         return JSONResponse(
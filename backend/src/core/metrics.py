@@ -0,0 +1,73 @@
+import threading
+from typing import Callable, Dict, Any
+
+class Counter:
+    __slots__ = ("value",)
+
+    def __init__(self) -> None:
+        self.value = 0
+
+    def inc(self, amount: int = 1) -> None:
+        self.value += amount
+
+class Timer:
+    """Acumula contagem, soma e máximo de durações (em segundos)."""
+    __slots__ = ("count", "total", "max")
+
+    def __init__(self) -> None:
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+
+    def observe(self, seconds: float) -> None:
+        self.count += 1
+        self.total += seconds
+        if seconds > self.max:
+            self.max = seconds
+
+    def snapshot(self) -> Dict[str, float]:
+        return {
+            "count": self.count,
+            "total_ms": round(self.total * 1000, 3),
+            "avg_ms": round(self.total * 1000 / self.count, 3) if self.count else 0.0,
+            "max_ms": round(self.max * 1000, 3),
+        }
+
+class MetricsRegistry:
+    """
+    Registro de métricas em memória do worker.
+    Counters e timers são criados uma vez (no import/decoração) e
+    incrementados sem lock no caminho quente.
+    """
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._counters: Dict[str, Counter] = {}
+        self._timers: Dict[str, Timer] = {}
+        self._gauges: Dict[str, Callable[[], Any]] = {}
+
+    def counter(self, name: str) -> Counter:
+        with self._lock:
+            return self._counters.setdefault(name, Counter())
+
+    def timer(self, name: str) -> Timer:
+        with self._lock:
+            return self._timers.setdefault(name, Timer())
+
+    def gauge(self, name: str, func: Callable[[], Any]) -> None:
+        with self._lock:
+            self._gauges[name] = func
+
+    def snapshot(self) -> Dict[str, Any]:
+        gauges = {}
+        for name, func in list(self._gauges.items()):
+            try:
+                gauges[name] = func()
+            except Exception:
+                gauges[name] = None
+        return {
+            "counters": {name: c.value for name, c in self._counters.items()},
+            "timers": {name: t.snapshot() for name, t in self._timers.items()},
+            "gauges": gauges,
+        }
+
+metrics = MetricsRegistry()
@@ -4,30 +4,133 @@ from fastapi.responses import JSONResponse
 from fastapi.middleware.cors import CORSMiddleware
 from src.core.config import get_settings
 from redis.asyncio import Redis
-from uuid import UUID, uuid4
+from typing import NamedTuple
+from collections import OrderedDict
 import time
 
+# GCRA (generic cell rate algorithm) executado no Redis em um único round-trip.
+# Guarda apenas o TAT (theoretical arrival time) por chave: memória O(1) e
+# atomicidade garantida pela execução do script.
+# KEYS[1] = chave; ARGV[1] = intervalo entre requisições (ms);
+# ARGV[2] = tolerância de rajada (ms) = intervalo * max_requests
+GCRA_SCRIPT = """
+local t = redis.call('TIME')
+local now = tonumber(t[1]) * 1000 + math.floor(tonumber(t[2]) / 1000)
+local emission = tonumber(ARGV[1])
+local burst = tonumber(ARGV[2])
+
+local tat = tonumber(redis.call('GET', KEYS[1]))
+if not tat or tat < now then
+    tat = now
+end
+
+local new_tat = tat + emission
+local allow_at = new_tat - burst
+if allow_at > now then
+    return {0, 0, allow_at - now, tat - now}
+end
+
+redis.call('SET', KEYS[1], new_tat, 'PX', new_tat - now)
+local remaining = math.floor((burst - (new_tat - now)) / emission)
+return {1, remaining, 0, new_tat - now}
+"""
+
+class RateLimitPolicy(NamedTuple):
+    max_requests: int
+    window: int
+
+class RateLimitResult(NamedTuple):
+    allowed: bool
+    limit: int
+    remaining: int
+    retry_after: float
+    reset_after: float
+
 class RateLimiter:
     def __init__(self, redis_client: Redis, max_requests=10, window=60):
         self.redis = redis_client
         self.max_requests = max_requests
         self.window = window
+        self.emission_ms = int(window * 1000 / max_requests)
+        self.burst_ms = self.emission_ms * max_requests
+        self._script = redis_client.register_script(GCRA_SCRIPT)
+
+    async def check(self, user_id) -> RateLimitResult:
+        key = f"rate_limit:gcra:{user_id}"
+        allowed, remaining, retry_after_ms, reset_after_ms = await self._script(
+            keys=[key], args=[self.emission_ms, self.burst_ms]
+        )
+        return RateLimitResult(
+            allowed=bool(allowed),
+            limit=self.max_requests,
+            remaining=int(remaining),
+            retry_after=int(retry_after_ms) / 1000,
+            reset_after=int(reset_after_ms) / 1000,
+        )
 
     async def allow_request(self, user_id) -> bool:
-        now = time.time()
-        key = f"rate_limit:{user_id}"
+        return (await self.check(user_id)).allowed
+
+class LocalTokenBucket:
+    """
+    Token bucket em memória do worker, usado como pré-checagem antes do Redis.
+    Com a mesma taxa da política global, um bucket local vazio significa que
+    só este worker já esgotou o limite: a requisição pode ser rejeitada sem
+    round-trip. O número de chaves é limitado (LRU).
+    """
+    def __init__(self, capacity: int, refill_per_second: float, max_keys: int = 10_000):
+        self.capacity = capacity
+        self.refill_per_second = refill_per_second
+        self.max_keys = max_keys
+        self._buckets: "OrderedDict[str, list]" = OrderedDict()
+
+    def try_acquire(self, key: str) -> float:
+        """Consome um token; retorna 0 se permitido ou os segundos até o próximo token."""
+        now = time.monotonic()
+        bucket = self._buckets.get(key)
+        if bucket is None:
+            bucket = [float(self.capacity), now]
+            self._buckets[key] = bucket
+            if len(self._buckets) > self.max_keys:
+                self._buckets.popitem(last=False)
+        else:
+            self._buckets.move_to_end(key)
+            tokens, last = bucket
+            bucket[0] = min(self.capacity, tokens + (now - last) * self.refill_per_second)
+            bucket[1] = now
+
+        if bucket[0] >= 1:
+            bucket[0] -= 1
+            return 0.0
+        return (1 - bucket[0]) / self.refill_per_second
+
+    def refund(self, key: str) -> None:
+        bucket = self._buckets.get(key)
+        if bucket is not None:
+            bucket[0] = min(self.capacity, bucket[0] + 1)
 
-        member = f"{now}-{uuid4()}"
+class RateLimitHeadersMiddleware:
+    """
+    Middleware ASGI que copia os headers X-RateLimit-* calculados pela
+    dependência de rate limit (request.state.rate_limit_headers) para a
+    resposta, inclusive quando a rota devolve um Response pronto.
+    """
+    def __init__(self, app):
+        self.app = app
 
-        pipe = self.redis.pipeline()
-        pipe.zadd(key, {member: now})
-        pipe.zremrangebyscore(key, 0, now - self.window)
-        pipe.zcard(key)
-        pipe.expire(key, int(self.window * 2))
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
 
-        _, _, request_count, _ = await pipe.execute()
+        async def send_with_headers(message):
+            if message["type"] == "http.response.start":
+                headers = (scope.get("state") or {}).get("rate_limit_headers")
+                if headers:
+                    message["headers"] = list(message.get("headers", [])) + [
+                        (name.lower().encode("latin-1"), value.encode("latin-1"))
+                        for name, value in headers.items()
+                    ]
+            await send(message)
 
-        allowed = request_count <= self.max_requests
-        if not allowed:
-            await self.redis.zrem(key, member)
-        return allowed
\ No newline at end of file
+        await self.app(scope, receive, send_with_headers)
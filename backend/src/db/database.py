@@ -1,15 +1,148 @@
+import logging
+import os
+import time
+from typing import Dict, Iterable
 from sqlalchemy import create_engine
 from sqlalchemy.orm import sessionmaker, DeclarativeBase
 from sqlalchemy.ext.declarative import declarative_base
+from sqlalchemy.exc import TimeoutError as PoolTimeoutError
+from sqlalchemy.pool import AsyncAdaptedQueuePool
 from src.core.config import get_settings
+from src.core.metrics import metrics
+from src.db.redis import redis_client
 from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker
 
-engine = create_async_engine(url=get_settings().SQLALCHEMY_DATABASE_URL)
+logger = logging.getLogger(__name__)
+
+STICKY_PREFIX = "db:sticky:"
+
+class InstrumentedQueuePool(AsyncAdaptedQueuePool):
+    """
+    Pool padrão do engine async, medindo quanto tempo cada checkout espera
+    por uma conexão (inclui abrir uma nova quando o pool ainda pode crescer)
+    e quantos checkouts estouram o pool_timeout.
+    """
+    checkout_wait = metrics.timer("db.pool.checkout_wait")
+    checkout_timeouts = metrics.counter("db.pool.checkout_timeouts")
+
+    def _do_get(self):
+        started = time.perf_counter()
+        try:
+            return super()._do_get()
+        except PoolTimeoutError:
+            self.checkout_timeouts.inc()
+            raise
+        finally:
+            self.checkout_wait.observe(time.perf_counter() - started)
+
+def build_engine(url: str, name: str = "primary"):
+    """
+    Cria o engine async com as opções do Settings. Pool e cache de statements
+    são por processo: o total de conexões no Postgres é
+    workers * (DB_POOL_SIZE + DB_MAX_OVERFLOW).
+    """
+    settings = get_settings()
+    connect_args = {
+        # 0 desliga o cache de prepared statements (necessário atrás de pgbouncer em modo transaction)
+        "statement_cache_size": settings.DB_STATEMENT_CACHE_SIZE,
+        "command_timeout": settings.DB_COMMAND_TIMEOUT,
+        # identifica o worker em pg_stat_activity
+        "server_settings": {"application_name": f"{settings.DB_APPLICATION_NAME}:{name}:{os.getpid()}"},
+    }
+    new_engine = create_async_engine(
+        url=url,
+        poolclass=InstrumentedQueuePool,
+        pool_size=settings.DB_POOL_SIZE,
+        max_overflow=settings.DB_MAX_OVERFLOW,
+        pool_timeout=settings.DB_POOL_TIMEOUT,
+        pool_recycle=settings.DB_POOL_RECYCLE,
+        pool_pre_ping=settings.DB_POOL_PRE_PING,
+        connect_args=connect_args,
+    )
+    pool = new_engine.pool
+    capacity = settings.DB_POOL_SIZE + settings.DB_MAX_OVERFLOW
+    metrics.gauge(f"db.pool.{name}.checked_out", pool.checkedout)
+    metrics.gauge(f"db.pool.{name}.idle", pool.checkedin)
+    metrics.gauge(f"db.pool.{name}.overflow", lambda: max(pool.overflow(), 0))
+    metrics.gauge(f"db.pool.{name}.utilization", lambda: round(pool.checkedout() / capacity, 3) if capacity else 0.0)
+    return new_engine
+
+engine = build_engine(get_settings().SQLALCHEMY_DATABASE_URL)
+read_engine = (
+    build_engine(get_settings().SQLALCHEMY_READ_DATABASE_URL, name="replica")
+    if get_settings().SQLALCHEMY_READ_DATABASE_URL else engine
+)
 
 class Base(DeclarativeBase):
     pass
 
+class ReplicaStickiness:
+    """
+    Read-your-writes para a réplica: depois de um commit no primário, os
+    escopos das entidades alteradas (ex.: "user:<id>", "institution:<id>",
+    os mesmos nomes das tags de cache) leem do primário por ttl segundos.
+    A marca fica na memória do worker (efeito imediato) e no Redis, para
+    valer também nos outros workers. A consulta olha a memória primeiro e
+    só vai ao Redis quando ela não responde; uma marca achada lá também
+    fica na memória até expirar, para as próximas leituras do worker.
+    """
+    def __init__(self, redis_client, ttl: float) -> None:
+        self.redis = redis_client
+        self.ttl = ttl
+        self._local: Dict[str, float] = {}
+
+    async def mark(self, scopes: Iterable[str]) -> None:
+        """
+        Marca escopos que acabaram de ter escrita commitada. Espera a
+        gravação no Redis: quem invalida o cache logo depois precisa que
+        os outros workers já enxerguem a marca ao recarregar.
+        """
+        scopes = list(scopes)
+        if not scopes or self.ttl <= 0 or read_engine is engine:
+            return
+        until = time.monotonic() + self.ttl
+        for scope in scopes:
+            self._local[scope] = until
+        try:
+            pipe = self.redis.pipeline(transaction=False)
+            for scope in scopes:
+                pipe.set(f"{STICKY_PREFIX}{scope}", 1, px=int(self.ttl * 1000))
+            await pipe.execute()
+        except Exception as e:
+            logger.warning("ReplicaStickiness: falha ao gravar no Redis: %s", e)
+
+    async def is_sticky(self, scopes: Iterable[str]) -> bool:
+        scopes = list(scopes)
+        now = time.monotonic()
+        for scope in scopes:
+            until = self._local.get(scope)
+            if until is not None:
+                if until > now:
+                    return True
+                del self._local[scope]
+        if not scopes:
+            return False
+        try:
+            pipe = self.redis.pipeline(transaction=False)
+            for scope in scopes:
+                pipe.pttl(f"{STICKY_PREFIX}{scope}")
+            ttls = await pipe.execute()
+        except Exception as e:
+            # na dúvida, lê do primário
+            logger.warning("ReplicaStickiness: falha ao consultar Redis: %s", e)
+            return True
+        sticky = False
+        for scope, ttl in zip(scopes, ttls):
+            # -2: sem marca; -1: sem expiração (não deveria acontecer), vale só agora
+            if ttl > 0:
+                self._local[scope] = now + ttl / 1000
+            sticky = sticky or ttl != -2
+        return sticky
+
+read_stickiness = ReplicaStickiness(redis_client, ttl=get_settings().DB_READ_STICKY_SECONDS)
+
 SessionLocal = async_sessionmaker(engine, expire_on_commit=False)
+ReadSessionLocal = async_sessionmaker(read_engine, expire_on_commit=False)
 
 async def get_db():
     #async with engine.begin() as conn:
@@ -19,4 +152,13 @@ async def get_db():
     try:
         yield db
     finally:
-        await db.close()
\ No newline at end of file
+        await db.close()
+
+async def open_read_session(scopes: Iterable[str] = ()):
+    """
+    Abre uma sessão somente leitura: réplica quando configurada, primário
+    quando não há réplica ou algum dos escopos teve escrita recente.
+    """
+    if read_engine is engine or await read_stickiness.is_sticky(scopes):
+        return SessionLocal()
+    return ReadSessionLocal()
@@ -2,9 +2,16 @@ from redis.asyncio import Redis
 from src.core.config import get_settings
 from fastapi_cache import FastAPICache
 from fastapi_cache.backends.redis import RedisBackend
+from typing import Dict
+import asyncio
+import logging
+import time
+
+logger = logging.getLogger(__name__)
 
 JTI_EXPIRY = 3600
 BLOCK_PREFIX = "jwt:blocklist:"
+REVOKED_CHANNEL = "jwt:revoked"
 
 redis_client = Redis(
     host=get_settings().REDIS_HOST,
@@ -12,8 +19,91 @@ redis_client = Redis(
     password=get_settings().REDIS_PASSWORD,
 )
 
+class LocalBlocklist:
+    """
+    Cópia local (por worker) dos JTIs revogados, com expiração.
+    Enquanto sincronizada (pub/sub + varredura periódica), um JTI ausente
+    aqui não precisa de consulta ao Redis.
+    """
+    def __init__(self) -> None:
+        self._entries: Dict[str, float] = {}
+        self.synced = False
+
+    def add(self, jti: str, ttl: float = JTI_EXPIRY) -> None:
+        self._entries[jti] = time.time() + ttl
+
+    def might_contain(self, jti: str) -> bool:
+        expires_at = self._entries.get(jti)
+        if expires_at is None:
+            return False
+        if expires_at <= time.time():
+            self._entries.pop(jti, None)
+            return False
+        return True
+
+    async def resync(self, client: Redis) -> None:
+        """Reconstrói a cópia local a partir das chaves jwt:blocklist:* do Redis."""
+        entries: Dict[str, float] = {}
+        now = time.time()
+        keys = [key async for key in client.scan_iter(match=f"{BLOCK_PREFIX}*", count=1000)]
+        if keys:
+            pipe = client.pipeline(transaction=False)
+            for key in keys:
+                pipe.pttl(key)
+            for key, pttl in zip(keys, await pipe.execute()):
+                if pttl is None or pttl == -2:
+                    continue
+                name = key.decode("utf-8") if isinstance(key, bytes) else key
+                ttl = pttl / 1000 if pttl > 0 else JTI_EXPIRY
+                entries[name[len(BLOCK_PREFIX):]] = now + ttl
+        # revogações recebidas via pub/sub durante a varredura são mantidas
+        for jti, expires_at in self._entries.items():
+            if expires_at > now:
+                entries.setdefault(jti, expires_at)
+        self._entries = entries
+
+local_blocklist = LocalBlocklist()
+
 async def add_jti_to_blocklist(jti: str) -> None:
     await redis_client.set(name=f"{BLOCK_PREFIX}{jti}", value="", ex=JTI_EXPIRY)
+    local_blocklist.add(jti)
+    await redis_client.publish(REVOKED_CHANNEL, jti)
 
 async def token_in_blocklist(jti: str) -> bool:
-    return await redis_client.exists(f"{BLOCK_PREFIX}{jti}") == 1
\ No newline at end of file
+    if local_blocklist.synced and not local_blocklist.might_contain(jti):
+        return False
+    return await redis_client.exists(f"{BLOCK_PREFIX}{jti}") == 1
+
+async def sync_blocklist(resync_interval: float = 30.0, retry_interval: float = 1.0) -> None:
+    """
+    Mantém local_blocklist sincronizada: assina o canal de revogações antes
+    de varrer o Redis (para não perder revogações no meio) e revarre
+    periodicamente. Se a conexão cair, token_in_blocklist volta a consultar
+    o Redis até a próxima sincronização.
+    """
+    while True:
+        pubsub = redis_client.pubsub()
+        try:
+            await pubsub.subscribe(REVOKED_CHANNEL)
+            await local_blocklist.resync(redis_client)
+            local_blocklist.synced = True
+            next_resync = time.monotonic() + resync_interval
+            while True:
+                message = await pubsub.get_message(ignore_subscribe_messages=True, timeout=1.0)
+                if message is not None and message.get("type") == "message":
+                    data = message["data"]
+                    local_blocklist.add(data.decode("utf-8") if isinstance(data, bytes) else data)
+                if time.monotonic() >= next_resync:
+                    await local_blocklist.resync(redis_client)
+                    next_resync = time.monotonic() + resync_interval
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            logger.warning("Falha na sincronização da blocklist de JWT: %s", e)
+            await asyncio.sleep(retry_interval)
+        finally:
+            local_blocklist.synced = False
+            try:
+                await pubsub.aclose()
+            except Exception:
+                pass
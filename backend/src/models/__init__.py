@@ -1,5 +1,6 @@
 from src.models.user import User
 from src.models.channel import Channel, ChannelCredential, ChannelType, CredentialType
 from src.models.institution import Institution
+from src.models.message import Message, MessageMedia
 
-__all__ = ["User", "Institution", "Channel", "ChannelCredential", "ChannelType", "CredentialType"]
\ No newline at end of file
+__all__ = ["User", "Institution", "Channel", "ChannelCredential", "ChannelType", "CredentialType", "Message", "MessageMedia"]
\ No newline at end of file
@@ -1,17 +1,39 @@
-from sqlalchemy import Column, String, DateTime, Boolean, Enum, Text, LargeBinary
+from sqlalchemy import Column, String, DateTime, Boolean, Enum, Text, BigInteger, Integer, Index, text
 from sqlalchemy.dialects.postgresql import UUID, BYTEA
 from sqlalchemy.sql import func
 from src.db.database import Base
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 import uuid
 from datetime import datetime
+from typing import Optional
 
 class MediaType(str):
     IMAGE = "image"
     DOCUMENT = "document"
 
+class MessageStatus(str):
+    SCHEDULED = "scheduled"
+    SENDING = "sending"
+    SENT = "sent"
+    FAILED = "failed"
+
+# lane das mensagens avulsas (batch_id nulo) no ix_messages_due_lane
+NIL_LANE = "00000000-0000-0000-0000-000000000000"
+
 class Message(Base):
     __tablename__ = "messages"
+    __table_args__ = (
+        # fila de vencidas por lane (instância, lote), para o dispatcher repartir
+        # o lote entre elas; só as linhas ainda agendadas entram no índice
+        Index(
+            "ix_messages_due_lane",
+            "instance",
+            text(f"coalesce(batch_id, '{NIL_LANE}'::uuid)"),
+            "scheduled_at",
+            postgresql_where=text("status = 'scheduled'"),
+        ),
+        Index("ix_messages_sending", "updated_at", postgresql_where=text("status = 'sending'")),
+    )
 
     id: Mapped[uuid.UUID] = mapped_column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
     jid: Mapped[str] = mapped_column(String(), nullable=False, index=True)
@@ -19,11 +41,15 @@ class Message(Base):
     content: Mapped[str] = mapped_column(String(), nullable=False, default="")
     media: Mapped[bool] = mapped_column(Boolean, nullable=False, default=False)
     scheduled_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), nullable=False)
-    status: Mapped[str] = mapped_column(String(20), nullable=False, default="scheduled")
+    status: Mapped[str] = mapped_column(String(20), nullable=False, default=MessageStatus.SCHEDULED)
     created_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), server_default=func.now())
     updated_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
-    sent_at: Mapped[datetime] = mapped_column(DateTime(timezone=True))
-    error: Mapped[str] = mapped_column(Text)
+    sent_at: Mapped[Optional[datetime]] = mapped_column(DateTime(timezone=True))
+    error: Mapped[Optional[str]] = mapped_column(Text)
+    # reivindicações feitas pelo dispatcher (erros transitórios voltam para a fila até o limite)
+    attempts: Mapped[int] = mapped_column(Integer, nullable=False, default=0, server_default="0")
+    # lote de agendamento (campanha); None para mensagens avulsas
+    batch_id: Mapped[Optional[uuid.UUID]] = mapped_column(UUID(as_uuid=True), index=True)
 
 class MessageMedia(Base):
     __tablename__ = "message_media"
@@ -31,4 +57,10 @@ class MessageMedia(Base):
     id: Mapped[uuid.UUID] = mapped_column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
     media_name: Mapped[str] = mapped_column(String(), nullable=False)
     media_type: Mapped[str] = mapped_column(Enum(MediaType.IMAGE, MediaType.DOCUMENT, name="media_type_enum"), nullable=False)
-    media_data: Mapped[bytes] = mapped_column(LargeBinary, nullable=False)
\ No newline at end of file
+    content_type: Mapped[Optional[str]] = mapped_column(String(255))
+    # o conteúdo fica no blob store (MEDIA_STORE); aqui só metadados e hash
+    size_bytes: Mapped[int] = mapped_column(BigInteger, nullable=False)
+    sha256: Mapped[str] = mapped_column(String(64), nullable=False, index=True)
+    storage: Mapped[str] = mapped_column(String(20), nullable=False)
+    storage_key: Mapped[str] = mapped_column(String(), nullable=False)
+    created_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), server_default=func.now())
\ No newline at end of file
@@ -1,7 +1,7 @@
 from src.db.database import Base
 from datetime import datetime
 from sqlalchemy.orm import Mapped, mapped_column, relationship
-from sqlalchemy import String, Boolean, DateTime, Enum, ForeignKey
+from sqlalchemy import String, Boolean, DateTime, Enum, ForeignKey, Index, text
 from sqlalchemy.dialects.postgresql import UUID
 import uuid
 from src.schemas.roles_schemas import Roles
@@ -12,6 +12,11 @@ if TYPE_CHECKING:
 
 class User(Base):
     __tablename__ = "users"
+    __table_args__ = (
+        # listagem por instituição: filtro + ORDER BY created_at DESC, id DESC direto do índice;
+        # a coluna líder também cobre as buscas só por institution_id (FK com ON DELETE SET NULL)
+        Index("ix_users_institution_created_at_id", "institution_id", text("created_at DESC"), text("id DESC")),
+    )
 
     id: Mapped[uuid.UUID] = mapped_column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
     username: Mapped[str] = mapped_column(String(50), unique=True, nullable=False)
@@ -27,7 +32,6 @@ class User(Base):
         UUID(as_uuid=True),
         ForeignKey("institution.id", ondelete="SET NULL"),
         nullable=True,
-        index=True,
     )
     institution: Mapped[list["Institution"]] = relationship("Institution", back_populates="users", passive_deletes=True)
 
@@ -38,4 +42,4 @@ class User(Base):
         return (
             f"<User id={self.id} username='{self.username}' "
             f"email='{self.email}' verified={self.is_verified}>"
-        )
\ No newline at end of file
+        )
@@ -17,13 +17,13 @@ from src.core.erros import InvalidToken, InvalidJTI
 from src.schemas.roles_schemas import Roles
 from src.schemas.emails_schemas import EmailModel
 from src.core.mail import mail, create_message
-from src.services.cache_service import CacheService
+from src.services.cache_service import CacheService, local_cache, user_tag
 from src.db.redis import redis_client
 
 auth_router = APIRouter(prefix=f"{get_settings().API_PREFIX}/{get_settings().API_VERSION}")
 user_service = UserService()
 role_checker = RoleChecker(['admin', 'user'])
-cache_service = CacheService(redis_client=redis_client)
+cache_service = CacheService(redis_client=redis_client, local_cache=local_cache)
 
 @auth_router.get('auth/refresh')
 async def get_new_access_token(token_details: dict = Depends(RefreshTokenBearer())):
@@ -46,7 +46,12 @@ async def revooke_token(token_details: dict = Depends(AccessTokenBearer())):
     return JSONResponse({"message": "Logged Out Successfully"}, status_code=status.HTTP_200_OK)
 
 @auth_router.get("/me", response_model=UserModel)
-@cache_service.cached(timeout=60, key_prefix='me')
+@cache_service.cached(
+    timeout=600,
+    key_prefix='me',
+    response_model=UserModel,
+    tags=lambda current_user, **_: [user_tag(current_user.id)],
+)
 async def get_current_user(request: Request, current_user = Depends(get_current_user), _: bool = Depends(role_checker)):
     return current_user
 
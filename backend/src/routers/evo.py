@@ -1,5 +1,5 @@
 from src.utils.token_auth import create_access_token, decode_token
-from fastapi import APIRouter, Depends, status, Query, File, UploadFile, Form
+from fastapi import APIRouter, Depends, status, Query, File, UploadFile, Form, Response
 from src.schemas.user_schemas import UserCreateModel, UserModel, UserLoginModel, User
 from src.services.user_service import UserService
 from src.db.database import get_db
@@ -10,7 +10,7 @@ from src.utils.email_verify import verify_email
 from src.utils.password_verify import validate_password_strength, verify_password
 from datetime import timedelta
 from fastapi.responses import JSONResponse
-from src.core.dependencies import AccessTokenBearer, get_current_user, RoleChecker, ensure_instance_exists
+from src.core.dependencies import AccessTokenBearer, get_current_user, RoleChecker, ensure_instance_exists, instance_registry
 from typing import List, Optional, Literal
 import json
 from src.schemas.evolution_schemas import (
@@ -21,20 +21,26 @@ from src.services.evolution_service import EvolutionService
 from src.utils.file_utils import is_upload_too_large
 from fastapi_cache.decorator import cache
 from src.db.redis import redis_client
-from src.services.cache_service import contacts_cache_key
+from src.services.cache_service import CacheService, contacts_cache_key, local_cache, model_renderer
 from fastapi.encoders import jsonable_encoder
-from src.models.message import MessageMedia
+from src.services.media_service import MediaService
 
 CACHE_TTL_SECONDS = 60
+CONTACTS_STALE_SECONDS = 300
 
 evo_router = APIRouter(prefix=f"{get_settings().API_PREFIX}/{get_settings().API_VERSION}")
 role_checker = RoleChecker(['admin'])
+cache_service = CacheService(redis_client=redis_client, local_cache=local_cache)
+render_contacts = model_renderer(EvoContactsOut)
+media_service = MediaService()
 
 @evo_router.get("/inboxes", response_model=List[EvoInstance], status_code=status.HTTP_200_OK, dependencies=[Depends(role_checker)])
 async def evo_instances(
     evo: EvolutionService = Depends(EvolutionService)
 ):
-    return await evo.fetch_instances()
+    instances = await evo.fetch_instances()
+    instance_registry.prime({i.name for i in instances if i.name})
+    return instances
 
 @evo_router.get("/contacts", response_model=EvoContactsOut, status_code=status.HTTP_200_OK)
 async def evo_contacts(
@@ -48,24 +54,19 @@ async def evo_contacts(
     except json.JSONDecodeError:
         raise HTTPException(status_code=400, detail="Parâmetro 'where' precisa ser um JSON válido")
 
-    cache_key = contacts_cache_key(instance, where_dict)
-
-    cached = await redis_client.get(cache_key)
-    if cached:
-        if isinstance(cached, (bytes, bytearray)):
-            cached = cached.decode("utf-8")
-        items = json.loads(cached)
-        print("há cache")
-        return EvoContactsOut(items=items)
-    print("não há cache")
-    contacts = await evo.find_contacts(where=where_dict, instance=instance)
-    items_serializable = jsonable_encoder(contacts)
-    try:
-        await redis_client.setex(cache_key, CACHE_TTL_SECONDS, json.dumps(items_serializable, separators=(",", ":")))
-    except Exception as e:
-        print(f"Redis setex falhou: {e}")
+    async def load_contacts() -> EvoContactsOut:
+        return EvoContactsOut(items=await evo.find_contacts(where=where_dict, instance=instance))
 
-    return EvoContactsOut(items=contacts)
+    cache_key = contacts_cache_key(instance, where_dict)
+    body = await cache_service.get_or_load(
+        cache_key,
+        load_contacts,
+        timeout=CACHE_TTL_SECONDS,
+        key_prefix="contacts",
+        stale_timeout=CONTACTS_STALE_SECONDS,
+        render=render_contacts,
+    )
+    return Response(content=body, media_type="application/json")
 
 @evo_router.get("/groups", response_model=EvoGroupsOut, status_code=status.HTTP_200_OK)
 async def evo_groups(
@@ -86,17 +87,11 @@ async def upload_file(file: UploadFile = File(...),
             status_code=status.HTTP_400_BAD_REQUEST,
             detail="Arquivo excede o limite de 10 MB."
         )
-    media_bytes = await file.read()
-    entity = MessageMedia(
-        media_name=file.filename,
-        media_type=media_type,
-        media_data=media_bytes
-    )
-    try:
-        session.add(entity)
-        await session.commit()
-        await session.refresh(entity)
-    except Exception as e:
-        await session.rollback()
-        raise HTTPException(detail=e)
-    return {"filename": file.filename, "content_type": file.content_type}
\ No newline at end of file
+    media = await media_service.save_upload(file=file, media_type=media_type, session=session)
+    return {
+        "id": str(media.id),
+        "filename": file.filename,
+        "content_type": file.content_type,
+        "size": media.size_bytes,
+        "sha256": media.sha256,
+    }
\ No newline at end of file
@@ -1,13 +1,16 @@
-from fastapi import APIRouter, Depends, status, Query
-from src.schemas.institution_schemas import InstitutionCreateModel, InstitutionModel, InstitutionUserCreateModel
-from src.services.institution_service import InstitutionService
+from fastapi import APIRouter, Depends, status, Query, Response
+from src.schemas.institution_schemas import InstitutionCreateModel, InstitutionModel, InstitutionPage, InstitutionUserCreateModel
+from typing import Optional, Union
+from src.services.cache_service import rows_renderer
+from src.services.institution_service import InstitutionService, INSTITUTIONS_SCOPE
 from src.db.database import get_db
 from sqlalchemy.ext.asyncio import AsyncSession
 from fastapi.exceptions import HTTPException
 from src.core.config import get_settings
 from src.utils.email_verify import verify_email
-from src.core.dependencies import AccessTokenBearer, get_current_user, RoleChecker, ensure_instance_exists
-from src.core.dependencies import rate_limit_dep
+from src.core.dependencies import AccessTokenBearer, get_current_user, read_db, RoleChecker, ensure_instance_exists
+from src.core.dependencies import rate_limit
+from src.core.middleware import RateLimitPolicy
 from src.services.user_service import UserService
 from src.schemas.user_schemas import UserModel, UserCreateModel
 from src.utils.password_verify import validate_password_strength, generate_random_password
@@ -17,8 +20,21 @@ institution_router = APIRouter(prefix=f"{get_settings().API_PREFIX}/{get_setting
 institution_service = InstitutionService()
 role_checker = RoleChecker(['superadmin'])
 user_service = UserService()
+get_institutions_read_db = read_db(lambda _: [INSTITUTIONS_SCOPE])
 
-@institution_router.post('/institutions', response_model=InstitutionModel, status_code=status.HTTP_201_CREATED, dependencies=[Depends(role_checker), Depends(rate_limit_dep)])
+InstitutionsResponse = Union[list[InstitutionModel], InstitutionPage]
+render_institutions = rows_renderer(InstitutionsResponse)
+institutions_read_limit = rate_limit(
+    "institutions",
+    default=RateLimitPolicy(max_requests=10, window=60),
+    per_role={"superadmin": RateLimitPolicy(max_requests=60, window=60)},
+)
+institutions_write_limit = rate_limit(
+    "institutions:write",
+    default=RateLimitPolicy(max_requests=10, window=60),
+)
+
+@institution_router.post('/institutions', response_model=InstitutionModel, status_code=status.HTTP_201_CREATED, dependencies=[Depends(role_checker), Depends(institutions_write_limit)])
 async def create_institution(institution_data: InstitutionCreateModel, session: AsyncSession = Depends(get_db)):
     email = verify_email(institution_data.email)
     institution_exists = await institution_service.institution_exist(email=email, session=session)
@@ -27,7 +43,7 @@ async def create_institution(institution_data: InstitutionCreateModel, session:
     new_institution = await institution_service.create_institution(institution_data=institution_data, session=session)
     return new_institution
 
-@institution_router.post('/institutions/new/users', response_model=UserModel, status_code=status.HTTP_201_CREATED, dependencies=[Depends(role_checker), Depends(rate_limit_dep)])
+@institution_router.post('/institutions/new/users', response_model=UserModel, status_code=status.HTTP_201_CREATED, dependencies=[Depends(role_checker), Depends(institutions_write_limit)])
 async def create_admin_account(admin_data: InstitutionUserCreateModel, session: AsyncSession = Depends(get_db)):
     email = verify_email(admin_data.email)
     password = generate_random_password(length=16)
@@ -51,15 +67,19 @@ async def create_admin_account(admin_data: InstitutionUserCreateModel, session:
     )
     return new_user
 
-@institution_router.get('/institutions',  response_model=list[InstitutionModel], status_code=status.HTTP_200_OK, dependencies=[Depends(role_checker), Depends(rate_limit_dep)],)
+@institution_router.get('/institutions',  response_model=InstitutionsResponse, status_code=status.HTTP_200_OK, dependencies=[Depends(role_checker), Depends(institutions_read_limit)],)
 async def get_all_institutions(
-    session: AsyncSession = Depends(get_db),
+    session: AsyncSession = Depends(get_institutions_read_db),
     _ = Depends(get_current_user),
     limit: int = Query(50, ge=1, le=200),
     offset: int = Query(0, ge=0),
+    cursor: Optional[str] = Query(None, description="Paginação por cursor: envie vazio na primeira página e depois o next_cursor recebido"),
 ):
+    if cursor is not None:
+        page = await institution_service.get_institutions_page(session=session, limit=limit, cursor=cursor)
+        return Response(content=render_institutions(page), media_type="application/json")
     try:
         institutions = await institution_service.get_all_institutions(session=session, limit=limit, offset=offset)
-        return institutions
+        return Response(content=render_institutions(institutions), media_type="application/json")
     except Exception as e:
         raise HTTPException(status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, detail=f"Erro ao obter instituições {e}")
\ No newline at end of file
@@ -1,13 +1,13 @@
 from src.utils.token_auth import create_access_token, decode_token, serialize_roles
-from fastapi import APIRouter, Depends, status, Response
+from fastapi import APIRouter, BackgroundTasks, Depends, status, Response
 from src.schemas.user_schemas import UserCreateModel, UserModel, UserLoginModel, UserPublic
 from src.services.user_service import UserService
-from src.db.database import get_db
+from src.core.dependencies import get_unscoped_read_db
 from sqlalchemy.ext.asyncio import AsyncSession
 from fastapi.exceptions import HTTPException
 from src.core.config import get_settings
 from src.utils.email_verify import verify_email
-from src.utils.password_verify import validate_password_strength, verify_password
+from src.utils.password_verify import validate_password_strength, verify_password_async, needs_rehash
 from datetime import timedelta, datetime, timezone
 from fastapi.responses import JSONResponse
 from src.core.erros import InvalidCredentials
@@ -24,13 +24,16 @@ login_router = APIRouter(prefix=f"{get_settings().API_PREFIX}/{get_settings().AP
 user_service = UserService()
 
 @login_router.post('/login')
-async def login_users(login_data: UserLoginModel, response: Response, session: AsyncSession = Depends(get_db)):
+async def login_users(login_data: UserLoginModel, response: Response, background_tasks: BackgroundTasks, session: AsyncSession = Depends(get_unscoped_read_db)):
     email = login_data.email
     password = login_data.password
     user = await user_service.get_user_by_email(email=email, session=session)
 
-    if not user or not verify_password(password=password, hash=user.password_hash):
+    if not user or not await verify_password_async(password=password, hash=user.password_hash):
         raise InvalidCredentials()
+    if needs_rehash(user.password_hash):
+        # parâmetros do argon2 mudaram: regrava o hash depois de enviar a resposta
+        background_tasks.add_task(user_service.rehash_password, user.id, user.password_hash, password)
     access_token = create_access_token(user_data={
         'email': user.email,
         'user_uid': str(user.id),
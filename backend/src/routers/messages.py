@@ -0,0 +1,75 @@
+from fastapi import APIRouter, Depends, status, Request
+from fastapi.concurrency import run_in_threadpool
+from sqlalchemy.ext.asyncio import AsyncSession
+from fastapi.exceptions import HTTPException
+from src.core.config import get_settings
+from src.db.database import get_db
+from src.core.dependencies import rate_limit, RoleChecker, instance_registry
+from src.core.middleware import RateLimitPolicy
+from src.schemas.message_schemas import BulkScheduleResponse
+from src.services.message_service import MessageService, parse_json_batch, parse_csv_batch
+from src.services.evolution_service import EvolutionService
+
+messages_router = APIRouter(prefix=f"{get_settings().API_PREFIX}/{get_settings().API_VERSION}")
+message_service = MessageService()
+role_checker = RoleChecker(['admin'])
+bulk_rate_limit = rate_limit(
+    "messages:bulk",
+    default=RateLimitPolicy(max_requests=10, window=60),
+)
+
+def _too_large(max_bytes: int) -> HTTPException:
+    return HTTPException(status_code=status.HTTP_413_CONTENT_TOO_LARGE, detail=f"Lote excede {max_bytes} bytes")
+
+async def _read_body(request: Request, max_bytes: int) -> bytes:
+    """
+    Lê o corpo em streaming até max_bytes: recusa antes pelo Content-Length
+    quando ele vem e, sem ele (chunked) ou com ele errado, assim que o
+    acumulado passa do limite, sem guardar o resto.
+    """
+    declared = request.headers.get("content-length", "")
+    if declared.isdigit() and int(declared) > max_bytes:
+        raise _too_large(max_bytes)
+    body = bytearray()
+    async for chunk in request.stream():
+        body += chunk
+        if len(body) > max_bytes:
+            raise _too_large(max_bytes)
+    return bytes(body)
+
+@messages_router.post('/messages/bulk', response_model=BulkScheduleResponse, status_code=status.HTTP_201_CREATED, dependencies=[Depends(role_checker), Depends(bulk_rate_limit)])
+async def schedule_bulk_messages(
+    request: Request,
+    session: AsyncSession = Depends(get_db),
+    evo: EvolutionService = Depends(EvolutionService),
+):
+    """
+    Agenda um lote de mensagens de uma vez.
+    Aceita um array JSON (application/json) ou CSV (text/csv) com as colunas
+    jid,instance,content,scheduled_at. O lote é validado por inteiro antes
+    de qualquer escrita e gravado com um único COPY. Corpos acima de
+    BULK_SCHEDULE_MAX_BYTES são recusados (413) sem serem lidos inteiros,
+    e o parse roda no threadpool, fora do event loop.
+    """
+    content_type = request.headers.get("content-type", "").split(";")[0].strip().lower()
+    if content_type in ("text/csv", "application/csv"):
+        parse = parse_csv_batch
+    elif content_type in ("", "application/json"):
+        parse = parse_json_batch
+    else:
+        raise HTTPException(status_code=status.HTTP_415_UNSUPPORTED_MEDIA_TYPE, detail="Use application/json ou text/csv")
+    body = await _read_body(request, get_settings().BULK_SCHEDULE_MAX_BYTES)
+    messages = await run_in_threadpool(parse, body)
+
+    if not messages:
+        raise HTTPException(status_code=status.HTTP_422_UNPROCESSABLE_CONTENT, detail="Lote vazio")
+    max_rows = get_settings().BULK_SCHEDULE_MAX_ROWS
+    if len(messages) > max_rows:
+        raise HTTPException(status_code=status.HTTP_413_CONTENT_TOO_LARGE, detail=f"Lote excede {max_rows} mensagens")
+
+    for instance in {m.instance for m in messages}:
+        if not await instance_registry.exists(instance, evo):
+            raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=f"Instância '{instance}' não encontrada")
+
+    batch_id = await message_service.schedule_bulk(messages, session=session)
+    return BulkScheduleResponse(batch_id=batch_id, count=len(messages))
@@ -0,0 +1,12 @@
+from fastapi import APIRouter, Depends
+from src.core.config import get_settings
+from src.core.dependencies import RoleChecker
+from src.core.metrics import metrics
+
+metrics_router = APIRouter(prefix=f"{get_settings().API_PREFIX}/{get_settings().API_VERSION}")
+role_checker = RoleChecker(['superadmin'])
+
+@metrics_router.get('/metrics', dependencies=[Depends(role_checker)])
+async def get_metrics():
+    """Snapshot das métricas em memória deste worker (cache, pool do banco, senhas)."""
+    return metrics.snapshot()
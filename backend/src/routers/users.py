@@ -1,6 +1,6 @@
 from src.utils.token_auth import create_access_token, decode_token
 from fastapi import APIRouter, Depends, status, Query, Body, Response, Request
-from src.schemas.user_schemas import UserModel, UserProfileChange
+from src.schemas.user_schemas import UserModel, UserPage, UserProfileChange
 from src.services.user_service import UserService
 from src.db.database import get_db
 from sqlalchemy.ext.asyncio import AsyncSession
@@ -11,27 +11,47 @@ from src.utils.password_verify import validate_password_strength, verify_passwor
 from datetime import timedelta
 from fastapi.responses import JSONResponse
 from uuid import UUID
+from typing import Optional, Union
 from src.models.user import User
 from src.utils.prevent_deletion import prevent_self_deletion
-from src.core.dependencies import rate_limit_dep, get_current_user, RoleChecker
+from src.core.dependencies import rate_limit, get_current_user, get_read_db, RoleChecker
+from src.core.middleware import RateLimitPolicy
 from src.core.erros import UserNotFound
-from src.services.cache_service import CacheService
+from src.services.cache_service import CacheService, local_cache, institution_tag, rows_renderer
 from src.db.redis import redis_client
 
 user_router = APIRouter(prefix=f"{get_settings().API_PREFIX}/{get_settings().API_VERSION}")
 user_service = UserService()
 role_checker = RoleChecker(['admin'])
-cache_service = CacheService(redis_client=redis_client)
+cache_service = CacheService(redis_client=redis_client, local_cache=local_cache)
+UsersResponse = Union[list[UserModel], UserPage]
+users_rate_limit = rate_limit(
+    "users",
+    default=RateLimitPolicy(max_requests=10, window=60),
+    per_role={
+        "admin": RateLimitPolicy(max_requests=120, window=60),
+        "superadmin": RateLimitPolicy(max_requests=120, window=60),
+    },
+)
 
-@user_router.get('/users',  response_model=list[UserModel], status_code=status.HTTP_200_OK, dependencies=[Depends(role_checker), Depends(rate_limit_dep)],)
-@cache_service.cached(timeout=60, key_prefix='users')
+@user_router.get('/users',  response_model=UsersResponse, status_code=status.HTTP_200_OK, dependencies=[Depends(role_checker), Depends(users_rate_limit)],)
+@cache_service.cached(
+    timeout=600,
+    key_prefix='users',
+    response_model=UsersResponse,
+    render=rows_renderer(UsersResponse),
+    tags=lambda current_user, **_: [institution_tag(current_user.institution_id)],
+)
 async def get_all_users(
     request: Request,
-    session: AsyncSession = Depends(get_db),
+    session: AsyncSession = Depends(get_read_db),
     current_user = Depends(get_current_user),
     limit: int = Query(50, ge=1, le=200),
     offset: int = Query(0, ge=0),
+    cursor: Optional[str] = Query(None, description="Paginação por cursor: envie vazio na primeira página e depois o next_cursor recebido"),
 ):
+    if cursor is not None:
+        return await user_service.get_users_page(current_user=current_user, session=session, limit=limit, cursor=cursor)
     try:
         users = await user_service.get_all_users(current_user=current_user, session=session, limit=limit, offset=offset)
         return users
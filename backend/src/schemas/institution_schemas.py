@@ -2,7 +2,7 @@ from pydantic import BaseModel, Field
 import uuid
 from datetime import datetime
 from src.schemas.roles_schemas import Roles
-from typing import Optional
+from typing import List, Optional
 from typing_extensions import Annotated
 from pydantic.types import StringConstraints
 
@@ -29,6 +29,10 @@ class InstitutionModel(BaseModel):
     created_at: datetime
     updated_at: datetime
 
+class InstitutionPage(BaseModel):
+    items: List[InstitutionModel]
+    next_cursor: Optional[str] = None
+
 class InstitutionUserCreateModel(BaseModel):
     first_name: str = Field(max_length=25)
     last_name: str = Field(max_length=25)
@@ -0,0 +1,12 @@
+from pydantic import BaseModel, Field, AwareDatetime
+import uuid
+
+class MessageScheduleModel(BaseModel):
+    jid: str = Field(min_length=1, max_length=100)
+    instance: str = Field(min_length=1, max_length=100)
+    content: str = Field(min_length=1, max_length=4096)
+    scheduled_at: AwareDatetime
+
+class BulkScheduleResponse(BaseModel):
+    batch_id: uuid.UUID
+    count: int
@@ -2,7 +2,7 @@ from pydantic import BaseModel, Field
 import uuid
 from datetime import datetime
 from src.schemas.roles_schemas import Roles
-from typing import Optional
+from typing import List, Optional
 
 class User(BaseModel):
     username: str = Field(max_length=100)
@@ -31,12 +31,29 @@ class UserModel(BaseModel):
     first_name: str
     last_name: str
     is_verified: bool
-    password_hash: str = Field(exclude=True)
+    password_hash: Optional[str] = Field(default=None, exclude=True)
     created_at: datetime
     updated_at: datetime
     role: str
     institution_id: uuid.UUID
 
+class UserPage(BaseModel):
+    items: List[UserModel]
+    next_cursor: Optional[str] = None
+
+class CurrentUserModel(BaseModel):
+    """Usuário autenticado em cache (sem password_hash)."""
+    id: uuid.UUID
+    username: str
+    email: str
+    first_name: str
+    last_name: str
+    is_verified: bool
+    created_at: datetime
+    updated_at: datetime
+    role: str
+    institution_id: Optional[uuid.UUID] = None
+
 class UserLoginModel(BaseModel):
     email: str
     password: str = Field(exclude=True)
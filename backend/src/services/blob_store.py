@@ -0,0 +1,160 @@
+import asyncio
+import hashlib
+import os
+import tempfile
+from typing import AsyncIterator, Callable, Dict, NamedTuple, Optional
+
+from fastapi import UploadFile
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.core.erros import MediaTooLarge
+
+class StoredBlob(NamedTuple):
+    key: str
+    size: int
+    sha256: str
+
+class LocalBlobWriter:
+    def __init__(self, root: str) -> None:
+        self.root = root
+        os.makedirs(os.path.join(root, "tmp"), exist_ok=True)
+        fd, self.tmp_path = tempfile.mkstemp(dir=os.path.join(root, "tmp"))
+        self._file = os.fdopen(fd, "wb")
+
+    async def write(self, chunk: bytes) -> None:
+        await asyncio.to_thread(self._file.write, chunk)
+
+    async def commit(self, sha256: str) -> str:
+        """Move o arquivo para um caminho endereçado pelo hash (arquivos iguais são gravados uma vez)."""
+        key = f"{sha256[:2]}/{sha256[2:4]}/{sha256}"
+        final_path = os.path.join(self.root, key)
+
+        def finish() -> None:
+            self._file.close()
+            os.makedirs(os.path.dirname(final_path), exist_ok=True)
+            os.replace(self.tmp_path, final_path)
+
+        await asyncio.to_thread(finish)
+        return key
+
+    async def abort(self) -> None:
+        def discard() -> None:
+            self._file.close()
+            try:
+                os.unlink(self.tmp_path)
+            except FileNotFoundError:
+                pass
+
+        await asyncio.to_thread(discard)
+
+class LocalBlobStore:
+    """Blobs em disco, em MEDIA_LOCAL_ROOT/<aa>/<bb>/<sha256>."""
+    name = "local"
+
+    def __init__(self, root: str) -> None:
+        self.root = root
+
+    async def open_writer(self, session: AsyncSession) -> LocalBlobWriter:
+        return await asyncio.to_thread(LocalBlobWriter, self.root)
+
+    async def read(self, key: str, session: AsyncSession, chunk_size: int) -> AsyncIterator[bytes]:
+        f = await asyncio.to_thread(open, os.path.join(self.root, key), "rb")
+        try:
+            while chunk := await asyncio.to_thread(f.read, chunk_size):
+                yield chunk
+        finally:
+            await asyncio.to_thread(f.close)
+
+    async def delete(self, key: str, session: AsyncSession) -> None:
+        # conteúdo é compartilhado entre uploads iguais: quem apaga deve checar as referências antes
+        try:
+            await asyncio.to_thread(os.unlink, os.path.join(self.root, key))
+        except FileNotFoundError:
+            pass
+
+class LargeObjectWriter:
+    def __init__(self, session: AsyncSession, oid: int) -> None:
+        self.session = session
+        self.oid = oid
+        self.offset = 0
+
+    async def write(self, chunk: bytes) -> None:
+        await self.session.execute(
+            text("SELECT lo_put(:oid, :offset, :data)"),
+            {"oid": self.oid, "offset": self.offset, "data": chunk},
+        )
+        self.offset += len(chunk)
+
+    async def commit(self, sha256: str) -> str:
+        return str(self.oid)
+
+    async def abort(self) -> None:
+        # o large object é transacional: o rollback da sessão já o descarta
+        pass
+
+class PostgresLargeObjectStore:
+    """
+    Blobs como large objects do Postgres (pg_largeobject), gravados em
+    pedaços com lo_put na mesma transação que a linha de message_media.
+    """
+    name = "postgres"
+
+    async def open_writer(self, session: AsyncSession) -> LargeObjectWriter:
+        oid = (await session.execute(text("SELECT lo_create(0)"))).scalar_one()
+        return LargeObjectWriter(session, oid)
+
+    async def read(self, key: str, session: AsyncSession, chunk_size: int) -> AsyncIterator[bytes]:
+        offset = 0
+        while True:
+            chunk = (await session.execute(
+                text("SELECT lo_get(:oid, :offset, :length)"),
+                {"oid": int(key), "offset": offset, "length": chunk_size},
+            )).scalar_one()
+            if not chunk:
+                return
+            yield chunk
+            offset += len(chunk)
+
+    async def delete(self, key: str, session: AsyncSession) -> None:
+        await session.execute(text("SELECT lo_unlink(:oid)"), {"oid": int(key)})
+
+BLOB_STORES: Dict[str, Callable[[str], object]] = {
+    LocalBlobStore.name: LocalBlobStore,
+    PostgresLargeObjectStore.name: lambda local_root: PostgresLargeObjectStore(),
+}
+
+def get_blob_store(name: str, local_root: str):
+    try:
+        return BLOB_STORES[name.lower()](local_root)
+    except KeyError:
+        raise ValueError(f"Blob store desconhecido: {name!r} (opções: {', '.join(BLOB_STORES)})")
+
+async def stream_upload(
+    file: UploadFile,
+    store,
+    session: Optional[AsyncSession],
+    chunk_size: int,
+    max_bytes: int,
+) -> StoredBlob:
+    """
+    Copia o upload para o blob store em pedaços de chunk_size, calculando
+    tamanho e sha256 no caminho. A memória usada não depende do tamanho do
+    arquivo (o multipart do Starlette já fica em um SpooledTemporaryFile).
+    """
+    hasher = hashlib.sha256()
+    size = 0
+    writer = await store.open_writer(session)
+    try:
+        while chunk := await file.read(chunk_size):
+            size += len(chunk)
+            if size > max_bytes:
+                raise MediaTooLarge()
+            hasher.update(chunk)
+            await writer.write(chunk)
+        sha256 = hasher.hexdigest()
+        key = await writer.commit(sha256)
+    except BaseException:
+        await writer.abort()
+        raise
+    return StoredBlob(key=key, size=size, sha256=sha256)
@@ -1,21 +1,521 @@
+import asyncio
 import json
 import hashlib
 import functools
 import inspect
-from typing import Optional, Callable, Any
+import time
+from collections import OrderedDict
+from typing import Optional, Callable, Any, Awaitable, Dict, Iterable, List, Sequence, Tuple
+from uuid import uuid4
 
-from fastapi import Request
+import structlog
+from fastapi import Request, Response
 from fastapi.encoders import jsonable_encoder
+from pydantic import TypeAdapter
+from sqlalchemy.engine import Row
 from redis.asyncio import Redis
+from src.core.metrics import metrics
+from src.core.config import get_settings
+from src.services.cache_codecs import get_codec
+
+logger = structlog.get_logger(__name__)
+
+_MISSING = object()
+_HANDOFF = object()
+
+INVALIDATION_CHANNEL = "cache:invalidate"
+# Identifica o worker nas mensagens de invalidação (ignora as próprias).
+NODE_ID = uuid4().hex
+
+# Cada tag tem um contador de geração ("tag:gen:<tag>") incrementado pelo
+# invalidate_tags. Dura bem mais que qualquer carga, para um contador expirado
+# não voltar a "0" no meio de uma.
+TAG_GENERATION_TTL = 86400
+
+# Grava a entrada e a registra nas tags só se nenhuma tag foi invalidada desde
+# que o loader começou (geração igual à lida antes da carga); senão devolve 0 e
+# o resultado, possivelmente lido antes da escrita, não é cacheado.
+# KEYS[1] = chave; KEYS[2] = cópia stale; KEYS[3..2+n] = tag:<tag>;
+# KEYS[3+n..2+2n] = tag:gen:<tag>
+# ARGV[1] = payload; ARGV[2] = ttl; ARGV[3] = stale_timeout; ARGV[4] = n;
+# ARGV[5..4+n] = gerações lidas antes da carga
+STORE_IF_CURRENT_SCRIPT = """
+local n = tonumber(ARGV[4])
+for i = 1, n do
+    if (redis.call('GET', KEYS[2 + n + i]) or '0') ~= ARGV[4 + i] then
+        return 0
+    end
+end
+local ttl = tonumber(ARGV[2])
+local stale = tonumber(ARGV[3])
+redis.call('SETEX', KEYS[1], ttl, ARGV[1])
+if stale > 0 then
+    redis.call('SETEX', KEYS[2], ttl + stale, ARGV[1])
+end
+for i = 1, n do
+    local tag_key = KEYS[2 + i]
+    redis.call('SADD', tag_key, KEYS[1])
+    if redis.call('TTL', tag_key) < ttl + stale then
+        redis.call('EXPIRE', tag_key, ttl + stale)
+    end
+end
+return 1
+"""
+
+# Libera o lock apenas se ainda pertencer a quem o adquiriu.
+RELEASE_LOCK_SCRIPT = """
+if redis.call('get', KEYS[1]) == ARGV[1] then
+    return redis.call('del', KEYS[1])
+end
+return 0
+"""
+
+class SingleFlight:
+    """
+    Coalesce chamadas concorrentes para a mesma chave dentro do processo:
+    só a primeira executa o loader, as demais aguardam o mesmo future.
+
+    Se o líder for cancelado (ex.: cliente desconectou), o future não é
+    cancelado: os seguidores recebem _HANDOFF e um deles assume a carga
+    com o próprio loader. O loader do líder pode depender de recursos da
+    requisição dele (sessão do banco), que são fechados junto com ela.
+    """
+    def __init__(self) -> None:
+        self._inflight: Dict[str, asyncio.Future] = {}
+
+    async def do(self, key: str, loader: Callable[[], Awaitable[Any]]) -> Any:
+        while (future := self._inflight.get(key)) is not None:
+            result = await asyncio.shield(future)
+            if result is not _HANDOFF:
+                return result
 
-class CacheService:
-    def __init__(self, redis_client: Redis, default_timeout: int = 60):
-        print("[CacheService.__init__] Iniciando CacheService")
-        print("[CacheService.__init__] redis_client:", redis_client)
-        print("[CacheService.__init__] default_timeout:", default_timeout)
+        future = asyncio.get_running_loop().create_future()
+        # evita "exception was never retrieved" quando não há seguidores
+        future.add_done_callback(lambda f: f.cancelled() or f.exception())
+        self._inflight[key] = future
+        try:
+            result = await loader()
+        except asyncio.CancelledError:
+            future.set_result(_HANDOFF)
+            raise
+        except BaseException as e:
+            future.set_exception(e)
+            raise
+        else:
+            future.set_result(result)
+            return result
+        finally:
+            if self._inflight.get(key) is future:
+                del self._inflight[key]
+
+class LocalCache:
+    """
+    Cache L1 em memória do worker: LRU com tamanho máximo e expiração
+    por entrada (alinhada ao TTL da chave no Redis).
+    """
+    def __init__(self, max_entries: int = 1024) -> None:
+        self.max_entries = max_entries
+        self._data: "OrderedDict[str, Tuple[float, Any]]" = OrderedDict()
+
+    def get(self, key: str) -> Any:
+        entry = self._data.get(key)
+        if entry is None:
+            return _MISSING
+        expires_at, value = entry
+        if expires_at <= time.monotonic():
+            self._data.pop(key, None)
+            return _MISSING
+        self._data.move_to_end(key)
+        return value
+
+    def set(self, key: str, value: Any, ttl: float) -> None:
+        if ttl <= 0:
+            return
+        self._data[key] = (time.monotonic() + ttl, value)
+        self._data.move_to_end(key)
+        while len(self._data) > self.max_entries:
+            self._data.popitem(last=False)
+
+    def delete(self, key: str) -> None:
+        self._data.pop(key, None)
+
+    def clear(self) -> None:
+        self._data.clear()
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+settings = get_settings()
+local_cache: Optional[LocalCache] = (
+    LocalCache(max_entries=settings.CACHE_LOCAL_MAX_ENTRIES)
+    if settings.CACHE_LOCAL_ENABLED else None
+)
+default_codec = get_codec(settings.CACHE_CODEC)
+
+def model_renderer(response_model: Any) -> Callable[[Any], bytes]:
+    """
+    Renderiza o resultado com o response_model (aceita objetos ORM) direto
+    para bytes JSON, aplicando os mesmos excludes da resposta da rota.
+    """
+    adapter = TypeAdapter(response_model)
+
+    def render(result: Any) -> bytes:
+        return adapter.dump_json(adapter.validate_python(result, from_attributes=True))
+
+    return render
+
+def rows_renderer(response_model: Any) -> Callable[[Any], bytes]:
+    """
+    Renderer rápido para listagens projetadas: quando o resultado é uma
+    lista de Row (ou {"items": [Row, ...], "next_cursor": ...}), serializa
+    as tuplas direto com orjson, sem validar pelo response_model. As colunas
+    do SELECT definem o JSON, então devem ser exatamente as do modelo.
+    Qualquer outro resultado (ou sem orjson instalado) usa o model_renderer.
+    """
+    fallback = model_renderer(response_model)
+    try:
+        import orjson
+    except ImportError:
+        return fallback
+
+    def is_rows(items: Any) -> bool:
+        return isinstance(items, list) and all(isinstance(item, Row) for item in items)
+
+    def render(result: Any) -> bytes:
+        if isinstance(result, dict) and is_rows(result.get("items")):
+            payload = {
+                "items": [row._asdict() for row in result["items"]],
+                "next_cursor": result.get("next_cursor"),
+            }
+        elif is_rows(result):
+            payload = [row._asdict() for row in result]
+        else:
+            return fallback(result)
+        # OPT_UTC_Z: datetimes em UTC saem com "Z", como no pydantic
+        return orjson.dumps(payload, option=orjson.OPT_UTC_Z)
+
+    return render
+
+async def publish_invalidation(redis_client: Redis, keys: Iterable[str]) -> None:
+    """Avisa os outros workers para descartarem essas chaves do L1."""
+    keys = list(keys)
+    if not keys:
+        return
+    try:
+        await redis_client.publish(INVALIDATION_CHANNEL, json.dumps([NODE_ID, keys]))
+    except Exception as e:
+        logger.warning("cache.invalidation_publish_failed", error=str(e))
+
+async def listen_for_invalidations(redis_client: Redis, cache: LocalCache, retry_interval: float = 1.0) -> None:
+    """
+    Consome o canal de invalidação e remove as chaves do L1 local.
+    Roda como task do lifespan; ao reconectar, limpa o L1 porque
+    mensagens podem ter sido perdidas.
+    """
+    while True:
+        pubsub = redis_client.pubsub()
+        try:
+            await pubsub.subscribe(INVALIDATION_CHANNEL)
+            async for message in pubsub.listen():
+                if message.get("type") != "message":
+                    continue
+                try:
+                    node_id, keys = json.loads(message["data"])
+                except (TypeError, ValueError):
+                    continue
+                if node_id == NODE_ID:
+                    continue
+                for key in keys:
+                    cache.delete(key)
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            logger.warning("cache.invalidation_listener_error", error=str(e))
+            cache.clear()
+            await asyncio.sleep(retry_interval)
+        finally:
+            try:
+                await pubsub.aclose()
+            except Exception:
+                pass
+
+class CacheStats:
+    __slots__ = ("hits", "local_hits", "misses", "stale_hits", "errors", "hit_latency", "miss_latency")
+
+    def __init__(self, key_prefix: str) -> None:
+        self.hits = metrics.counter(f"cache.{key_prefix}.hits")
+        self.local_hits = metrics.counter(f"cache.{key_prefix}.local_hits")
+        self.misses = metrics.counter(f"cache.{key_prefix}.misses")
+        self.stale_hits = metrics.counter(f"cache.{key_prefix}.stale_hits")
+        self.errors = metrics.counter(f"cache.{key_prefix}.decode_errors")
+        self.hit_latency = metrics.timer(f"cache.{key_prefix}.hit_latency")
+        self.miss_latency = metrics.timer(f"cache.{key_prefix}.miss_latency")
 
+class CacheService:
+    def __init__(
+        self,
+        redis_client: Redis,
+        default_timeout: int = 60,
+        lock_timeout: float = 10.0,
+        stale_timeout: int = 0,
+        lock_poll_interval: float = 0.05,
+        local_cache: Optional[LocalCache] = None,
+        codec: Any = None,
+    ):
+        """
+        :param lock_timeout: validade (s) do lock distribuído de recomputação
+        :param stale_timeout: por quanto tempo (s) após expirar uma cópia antiga
+            pode ser servida enquanto outro worker recalcula (0 desativa)
+        :param local_cache: L1 em memória na frente do Redis (None desativa)
+        :param codec: serialização dos valores no Redis (padrão: CACHE_CODEC)
+        """
         self.redis_client = redis_client
         self.default_timeout = default_timeout
+        self.lock_timeout = lock_timeout
+        self.stale_timeout = stale_timeout
+        self.lock_poll_interval = lock_poll_interval
+        self.local_cache = local_cache
+        self.codec = codec or default_codec
+        self._flights = SingleFlight()
+        self._stats: Dict[str, CacheStats] = {}
+
+    def stats(self, key_prefix: str) -> CacheStats:
+        stats = self._stats.get(key_prefix)
+        if stats is None:
+            stats = self._stats[key_prefix] = CacheStats(key_prefix)
+        return stats
+
+    def _decode(self, raw: Any, cache_key: str, stats: CacheStats, render: Optional[Callable] = None) -> Any:
+        if render is not None:
+            return bytes(raw)
+        try:
+            return self.codec.decode(raw)
+        except Exception as e:
+            stats.errors.inc()
+            logger.warning("cache.decode_error", key=cache_key, error=str(e))
+            return _MISSING
+
+    async def _store(
+        self,
+        cache_key: str,
+        result: Any,
+        ttl: int,
+        stale_timeout: int,
+        render: Optional[Callable] = None,
+        tags: Sequence[str] = (),
+        generations: Sequence[str] = (),
+    ) -> Any:
+        """
+        Grava o resultado e devolve o valor como será lido nos hits: os bytes
+        já renderizados (com render) ou a estrutura serializável.
+        Com tags, só grava se as gerações delas ainda forem as lidas antes
+        da carga (ver _tag_generations).
+        """
+        if render is not None:
+            value = payload = render(result)
+        else:
+            value = jsonable_encoder(result)
+            payload = self.codec.encode(value)
+        try:
+            if tags:
+                stored = await self.redis_client.eval(
+                    STORE_IF_CURRENT_SCRIPT,
+                    2 + 2 * len(tags),
+                    cache_key,
+                    f"stale:{cache_key}",
+                    *(f"tag:{tag}" for tag in tags),
+                    *(f"tag:gen:{tag}" for tag in tags),
+                    payload,
+                    ttl,
+                    stale_timeout,
+                    len(tags),
+                    *generations,
+                )
+                if not stored:
+                    logger.debug("cache.store_skipped_invalidated", key=cache_key, tags=list(tags))
+                    return value
+            else:
+                pipe = self.redis_client.pipeline(transaction=False)
+                pipe.setex(cache_key, ttl, payload)
+                if stale_timeout:
+                    pipe.setex(f"stale:{cache_key}", ttl + stale_timeout, payload)
+                await pipe.execute()
+        except Exception as e:
+            logger.warning("cache.store_failed", key=cache_key, error=str(e))
+        if self.local_cache is not None:
+            self.local_cache.set(cache_key, value, ttl)
+            await publish_invalidation(self.redis_client, [cache_key])
+        return value
+
+    async def _tag_generations(self, tags: Sequence[str]) -> List[str]:
+        """Gerações atuais das tags ("0" para tag nunca invalidada)."""
+        if not tags:
+            return []
+        values = await self.redis_client.mget([f"tag:gen:{tag}" for tag in tags])
+        return [
+            value.decode("utf-8") if isinstance(value, bytes) else (value or "0")
+            for value in values
+        ]
+
+    async def _get_with_ttl(self, cache_key: str) -> Tuple[Any, Optional[float]]:
+        pipe = self.redis_client.pipeline(transaction=False)
+        pipe.get(cache_key)
+        pipe.pttl(cache_key)
+        raw, pttl = await pipe.execute()
+        return raw, (pttl / 1000 if pttl and pttl > 0 else None)
+
+    async def invalidate(self, *keys: str) -> None:
+        """Remove as chaves do Redis, do L1 local e do L1 dos outros workers."""
+        if not keys:
+            return
+        if self.local_cache is not None:
+            for key in keys:
+                self.local_cache.delete(key)
+        await self.redis_client.delete(*keys, *(f"stale:{key}" for key in keys))
+        await publish_invalidation(self.redis_client, keys)
+
+    async def invalidate_tags(self, *tags: str) -> None:
+        """
+        Invalida todas as entradas registradas com essas tags (ex.:
+        "user:<id>", "institution:<id>") e avança a geração delas, para
+        que um loader que leu o banco antes da escrita não regrave a tag
+        com dados antigos. Falhas são apenas logadas, para não derrubar a
+        mutação que disparou a invalidação.
+        """
+        if not tags:
+            return
+        tag_keys = [f"tag:{tag}" for tag in tags]
+        try:
+            pipe = self.redis_client.pipeline(transaction=True)
+            for tag_key in tag_keys:
+                pipe.smembers(tag_key)
+            pipe.delete(*tag_keys)
+            # cargas que começaram antes daqui deixam de poder gravar (_store)
+            for tag in tags:
+                pipe.incr(f"tag:gen:{tag}")
+                pipe.expire(f"tag:gen:{tag}", TAG_GENERATION_TTL)
+            results = await pipe.execute()
+            members = results[:len(tag_keys)]
+            keys = {
+                key.decode("utf-8") if isinstance(key, bytes) else key
+                for group in members for key in group
+            }
+            await self.invalidate(*keys)
+        except Exception as e:
+            logger.warning("cache.invalidate_tags_failed", tags=list(tags), error=str(e))
+
+    async def _wait_for_fill(self, cache_key: str, stats: CacheStats, render: Optional[Callable]) -> Any:
+        deadline = time.monotonic() + self.lock_timeout
+        while time.monotonic() < deadline:
+            await asyncio.sleep(self.lock_poll_interval)
+            raw = await self.redis_client.get(cache_key)
+            if raw is not None:
+                return self._decode(raw, cache_key, stats, render)
+        return _MISSING
+
+    async def _load_locked(
+        self,
+        cache_key: str,
+        loader: Callable[[], Awaitable[Any]],
+        ttl: int,
+        stale_timeout: int,
+        stats: CacheStats,
+        render: Optional[Callable] = None,
+        tags: Iterable[str] = (),
+    ) -> Any:
+        """
+        Recalcula a entrada sob um lock curto no Redis, para que apenas um
+        worker vá ao banco/Evolution. Quem não pega o lock serve a cópia
+        stale (se habilitada) ou espera o dono do lock preencher a chave.
+        """
+        lock_key = f"lock:{cache_key}"
+        token = uuid4().hex
+        acquired = await self.redis_client.set(
+            lock_key, token, nx=True, px=int(self.lock_timeout * 1000)
+        )
+        if not acquired:
+            if stale_timeout:
+                raw = await self.redis_client.get(f"stale:{cache_key}")
+                if raw is not None:
+                    data = self._decode(raw, cache_key, stats, render)
+                    if data is not _MISSING:
+                        stats.stale_hits.inc()
+                        return data
+            data = await self._wait_for_fill(cache_key, stats, render)
+            if data is not _MISSING:
+                return data
+            logger.warning("cache.lock_wait_timeout", key=cache_key)
+
+        try:
+            # lida antes do loader: uma invalidação durante a carga impede a gravação
+            tags = tuple(tags)
+            generations = await self._tag_generations(tags)
+            result = await loader()
+            value = await self._store(cache_key, result, ttl, stale_timeout, render, tags, generations)
+            return value if render is not None else result
+        finally:
+            if acquired:
+                try:
+                    await self.redis_client.eval(RELEASE_LOCK_SCRIPT, 1, lock_key, token)
+                except Exception as e:
+                    logger.warning("cache.lock_release_failed", key=cache_key, error=str(e))
+
+    async def get_or_load(
+        self,
+        cache_key: str,
+        loader: Callable[[], Awaitable[Any]],
+        timeout: Optional[int] = None,
+        key_prefix: str = "view",
+        stale_timeout: Optional[int] = None,
+        render: Optional[Callable[[Any], bytes]] = None,
+        tags: Iterable[str] = (),
+    ) -> Any:
+        """
+        Retorna o valor em cache (já decodificado) ou executa o loader com
+        proteção contra stampede: single-flight no processo + lock no Redis.
+
+        Com render, o cache guarda os bytes da resposta já renderizada e
+        devolve sempre bytes (hit ou miss), sem decode nem revalidação.
+        Essas entradas ficam em "body:<cache_key>", separadas das entradas
+        codificadas pelo codec.
+
+        tags registram a entrada para invalidação via invalidate_tags.
+        """
+        if render is not None:
+            cache_key = f"body:{cache_key}"
+        stats = self.stats(key_prefix)
+        started = time.perf_counter()
+
+        if self.local_cache is not None:
+            data = self.local_cache.get(cache_key)
+            if data is not _MISSING:
+                stats.local_hits.inc()
+                stats.hit_latency.observe(time.perf_counter() - started)
+                return data
+            raw, remaining = await self._get_with_ttl(cache_key)
+        else:
+            raw, remaining = await self.redis_client.get(cache_key), None
+
+        if raw is not None:
+            data = self._decode(raw, cache_key, stats, render)
+            if data is not _MISSING:
+                if remaining:
+                    self.local_cache.set(cache_key, data, remaining)
+                stats.hits.inc()
+                stats.hit_latency.observe(time.perf_counter() - started)
+                logger.debug("cache.hit", key=cache_key)
+                return data
+
+        stats.misses.inc()
+        logger.debug("cache.miss", key=cache_key)
+        ttl = timeout or self.default_timeout
+        stale = self.stale_timeout if stale_timeout is None else stale_timeout
+        result = await self._flights.do(
+            cache_key,
+            lambda: self._load_locked(cache_key, loader, ttl, stale, stats, render, tags),
+        )
+        stats.miss_latency.observe(time.perf_counter() - started)
+        return result
 
     def _build_base_key(
         self,
@@ -26,243 +526,101 @@ class CacheService:
         Base da chave: path + query params (se tiver Request)
         ou nome da função (fallback).
         """
-        print("\n[CacheService._build_base_key] Chamado")
-        print("[CacheService._build_base_key] function.__name__:", function.__name__)
-        print("[CacheService._build_base_key] request presente?:", request is not None)
+        if request is None:
+            return function.__name__
 
-        if request is not None:
+        base = request.url.path
+        if request.query_params:
             qp = "&".join(
                 f"{k}={v}" for k, v in sorted(request.query_params.items())
             )
-            print("[CacheService._build_base_key] query_params raw:", dict(request.query_params))
-            print("[CacheService._build_base_key] query_params string:", qp)
-
-            base = request.url.path
-            print("[CacheService._build_base_key] request.url.path:", base)
-
-            if qp:
-                base = f"{base}?{qp}"
-                print("[CacheService._build_base_key] base com query params:", base)
-        else:
-            base = function.__name__
-            print("[CacheService._build_base_key] Sem request, usando nome da função como base:", base)
-
-        print("[CacheService._build_base_key] base final:", base)
+            base = f"{base}?{qp}"
         return base
 
+    def _extract_request(self, args, kwargs) -> Optional[Request]:
+        request = kwargs.get("request")
+        if request is not None:
+            return request
+        for arg in args:
+            if isinstance(arg, Request):
+                return arg
+        return None
+
     def _extract_current_user(self, args, kwargs) -> Any:
         """
         Tenta achar o current_user nos kwargs/args.
         """
-        print("\n[CacheService._extract_current_user] Chamado")
-        print("[CacheService._extract_current_user] kwargs keys:", list(kwargs.keys()))
-        print("[CacheService._extract_current_user] qntd args:", len(args))
-
         if "current_user" in kwargs:
-            print("[CacheService._extract_current_user] current_user encontrado em kwargs")
             return kwargs["current_user"]
-
-        for idx, arg in enumerate(args):
-            print(f"[CacheService._extract_current_user] analisando arg[{idx}]:", type(arg))
+        for arg in args:
             if hasattr(arg, "id"):
-                print(f"[CacheService._extract_current_user] arg[{idx}] possui atributo 'id', retornando como current_user")
                 return arg
-
-        print("[CacheService._extract_current_user] Nenhum current_user encontrado")
         return None
 
+    def _build_cache_key(self, key_prefix: str, function: Callable, args, kwargs) -> str:
+        request = self._extract_request(args, kwargs)
+        current_user = self._extract_current_user(args, kwargs)
+        user_id_value = getattr(current_user, "id", None) if current_user is not None else None
+
+        base_key = self._build_base_key(request, function)
+        if user_id_value is not None:
+            return f"{key_prefix}:user:{user_id_value}:{base_key}"
+        return f"{key_prefix}:{base_key}"
+
     def cached(
         self,
         timeout: Optional[int] = None,
         key_prefix: str = "view",
+        stale_timeout: Optional[int] = None,
+        response_model: Any = None,
+        tags: Optional[Callable[..., Iterable[str]]] = None,
+        render: Optional[Callable[[Any], bytes]] = None,
     ) -> Callable:
-        print("\n[CacheService.cached] Decorator criado com:")
-        print("[CacheService.cached] timeout param:", timeout)
-        print("[CacheService.cached] key_prefix:", key_prefix)
-
+        """
+        :param response_model: quando informado, guarda a resposta já
+            renderizada com esse modelo e devolve um Response cru nos hits.
+        :param render: renderer próprio no lugar do model_renderer
+            (ex.: rows_renderer para listagens projetadas).
+        :param tags: recebe os mesmos argumentos da rota e devolve as tags
+            da entrada, ex.: lambda current_user, **_: [user_tag(current_user.id)]
+        """
         def decorator(function: Callable) -> Callable:
-            is_async = inspect.iscoroutinefunction(function)
-            print("\n[CacheService.cached.decorator] Registrando função no cache:")
-            print("[CacheService.cached.decorator] function.__name__:", function.__name__)
-            print("[CacheService.cached.decorator] is_async?:", is_async)
+            if not inspect.iscoroutinefunction(function):
+                raise TypeError(
+                    f"CacheService.cached suporta apenas funções async ({function.__name__})"
+                )
+            renderer = render
+            if renderer is None and response_model is not None:
+                renderer = model_renderer(response_model)
 
             @functools.wraps(function)
             async def async_wrapper(*args, **kwargs) -> Any:
-                print("\n[CacheService.async_wrapper] >>> Início (async)")
-                print("[CacheService.async_wrapper] function:", function.__name__)
-                print("[CacheService.async_wrapper] args len:", len(args))
-                print("[CacheService.async_wrapper] kwargs keys:", list(kwargs.keys()))
-
-                # Request
-                request: Optional[Request] = kwargs.get("request")
-                if request is None:
-                    print("[CacheService.async_wrapper] 'request' não encontrado em kwargs, procurando em args...")
-                    for idx, arg in enumerate(args):
-                        print(f"[CacheService.async_wrapper] analisando arg[{idx}]:", type(arg))
-                        if isinstance(arg, Request):
-                            print(f"[CacheService.async_wrapper] Request encontrado em arg[{idx}]")
-                            request = arg
-                            break
-                else:
-                    print("[CacheService.async_wrapper] Request encontrado em kwargs")
-
-                # current_user (já resolvido pelo FastAPI via Depends)
-                current_user = self._extract_current_user(args, kwargs)
-                if current_user is not None:
-                    user_id_value = getattr(current_user, "id", None)
-                    print("[CacheService.async_wrapper] current_user encontrado, id:", user_id_value)
-                else:
-                    user_id_value = None
-                    print("[CacheService.async_wrapper] current_user NÃO encontrado")
-
-                base_key = self._build_base_key(request, function)
-
-                if user_id_value is not None:
-                    cache_key = f"{key_prefix}:user:{user_id_value}:{base_key}"
-                else:
-                    cache_key = f"{key_prefix}:{base_key}"
-
-                print("[CacheService.async_wrapper] cache_key construída:", cache_key)
-
-                # GET do Redis
-                print("[CacheService.async_wrapper] Chamando Redis.get(...)")
-                cached = await self.redis_client.get(cache_key)
-                print("[CacheService.async_wrapper] Resultado Redis.get:", type(cached), cached)
-
-                if cached is not None:
-                    if isinstance(cached, (bytes, bytearray)):
-                        print("[CacheService.async_wrapper] cached é bytes, fazendo decode UTF-8")
-                        cached = cached.decode("utf-8")
-
-                    try:
-                        data = json.loads(cached)
-                        print("[CacheService.async_wrapper] JSON carregado com sucesso")
-                        print("[CacheService.async_wrapper] >>> HÁ cache para:", cache_key)
-                        return data
-                    except json.JSONDecodeError as e:
-                        print("[CacheService.async_wrapper] ERRO ao decodificar JSON do cache:", e)
-                        print("[CacheService.async_wrapper] Ignorando cache corrompido e seguindo...")
-
-                # miss de cache
-                print("[CacheService.async_wrapper] >>> NÃO há cache para:", cache_key)
-                print("[CacheService.async_wrapper] Chamando função original:", function.__name__)
-                result = await function(*args, **kwargs)
-                print("[CacheService.async_wrapper] Função original retornou tipo:", type(result))
-
-                serializable = jsonable_encoder(result)
-                print("[CacheService.async_wrapper] Resultado após jsonable_encoder, tipo:", type(serializable))
-
-                payload = json.dumps(serializable)
-                print("[CacheService.async_wrapper] Payload JSON gerado (len):", len(payload))
-
-                ttl = timeout or self.default_timeout
-                print("[CacheService.async_wrapper] TTL utilizado:", ttl)
-
-                print("[CacheService.async_wrapper] Chamando Redis.setex(...)")
-                await self.redis_client.setex(cache_key, ttl, payload)
-                print("[CacheService.async_wrapper] Valor salvo no Redis com sucesso")
-
-                print("[CacheService.async_wrapper] >>> Fim (async), retornando resultado original")
-                return result
-
-            @functools.wraps(function)
-            def sync_wrapper(*args, **kwargs) -> Any:
-                print("\n[CacheService.sync_wrapper] >>> Início (sync)")
-                print("[CacheService.sync_wrapper] function:", function.__name__)
-                print("[CacheService.sync_wrapper] args len:", len(args))
-                print("[CacheService.sync_wrapper] kwargs keys:", list(kwargs.keys()))
-
-                request: Optional[Request] = kwargs.get("request")
-                if request is None:
-                    print("[CacheService.sync_wrapper] 'request' não encontrado em kwargs, procurando em args...")
-                    for idx, arg in enumerate(args):
-                        print(f"[CacheService.sync_wrapper] analisando arg[{idx}]:", type(arg))
-                        if isinstance(arg, Request):
-                            print(f"[CacheService.sync_wrapper] Request encontrado em arg[{idx}]")
-                            request = arg
-                            break
-                else:
-                    print("[CacheService.sync_wrapper] Request encontrado em kwargs")
-
-                current_user = self._extract_current_user(args, kwargs)
-                if current_user is not None:
-                    user_id_value = getattr(current_user, "id", None)
-                    print("[CacheService.sync_wrapper] current_user encontrado, id:", user_id_value)
-                else:
-                    user_id_value = None
-                    print("[CacheService.sync_wrapper] current_user NÃO encontrado")
-
-                base_key = self._build_base_key(request, function)
-
-                if user_id_value is not None:
-                    cache_key = f"{key_prefix}:user:{user_id_value}:{base_key}"
-                else:
-                    cache_key = f"{key_prefix}:{base_key}"
-
-                print("[CacheService.sync_wrapper] cache_key construída:", cache_key)
-
-                print("[CacheService.sync_wrapper] Chamando Redis.get(...) (sync)")
-                cached = self.redis_client.get(cache_key)
-                print("[CacheService.sync_wrapper] Resultado Redis.get:", type(cached), cached)
-
-                if cached is not None:
-                    if isinstance(cached, (bytes, bytearray)):
-                        print("[CacheService.sync_wrapper] cached é bytes, fazendo decode UTF-8")
-                        cached = cached.decode("utf-8")
-
-                    try:
-                        data = json.loads(cached)
-                        print("[CacheService.sync_wrapper] JSON carregado com sucesso")
-                        print("[CacheService.sync_wrapper] >>> HÁ cache para:", cache_key)
-                        return data
-                    except json.JSONDecodeError as e:
-                        print("[CacheService.sync_wrapper] ERRO ao decodificar JSON do cache:", e)
-                        print("[CacheService.sync_wrapper] Ignorando cache corrompido e seguindo...")
-
-                print("[CacheService.sync_wrapper] >>> NÃO há cache para:", cache_key)
-                print("[CacheService.sync_wrapper] Chamando função original:", function.__name__)
-                result = function(*args, **kwargs)
-                print("[CacheService.sync_wrapper] Função original retornou tipo:", type(result))
-
-                serializable = jsonable_encoder(result)
-                print("[CacheService.sync_wrapper] Resultado após jsonable_encoder, tipo:", type(serializable))
-
-                payload = json.dumps(serializable)
-                print("[CacheService.sync_wrapper] Payload JSON gerado (len):", len(payload))
-
-                ttl = timeout or self.default_timeout
-                print("[CacheService.sync_wrapper] TTL utilizado:", ttl)
-
-                print("[CacheService.sync_wrapper] Chamando Redis.setex(...) (sync)")
-                self.redis_client.setex(cache_key, ttl, payload)
-                print("[CacheService.sync_wrapper] Valor salvo no Redis com sucesso")
+                cache_key = self._build_cache_key(key_prefix, function, args, kwargs)
+                data = await self.get_or_load(
+                    cache_key,
+                    lambda: function(*args, **kwargs),
+                    timeout=timeout,
+                    key_prefix=key_prefix,
+                    stale_timeout=stale_timeout,
+                    render=renderer,
+                    tags=tags(*args, **kwargs) if tags is not None else (),
+                )
+                if renderer is not None:
+                    return Response(content=data, media_type="application/json")
+                return data
+
+            return async_wrapper
 
-                print("[CacheService.sync_wrapper] >>> Fim (sync), retornando resultado original")
-                return result
+        return decorator
 
-            # Loga qual wrapper será usado
-            if is_async:
-                print("[CacheService.cached.decorator] Retornando async_wrapper para função:", function.__name__)
-                return async_wrapper
-            else:
-                print("[CacheService.cached.decorator] Retornando sync_wrapper para função:", function.__name__)
-                return sync_wrapper
 
-        return decorator
+def user_tag(user_id: Any) -> str:
+    return f"user:{user_id}"
 
+def institution_tag(institution_id: Any) -> str:
+    return f"institution:{institution_id}"
 
 def contacts_cache_key(instance: str, where_dict: Optional[dict]) -> str:
-    print("\n[contacts_cache_key] Chamado")
-    print("[contacts_cache_key] instance:", instance)
-    print("[contacts_cache_key] where_dict:", where_dict)
-
     where_norm = json.dumps(where_dict or {}, sort_keys=True, separators=(",", ":"))
-    print("[contacts_cache_key] where_norm:", where_norm)
-
     where_hash = hashlib.sha1(where_norm.encode("utf-8")).hexdigest()
-    print("[contacts_cache_key] where_hash:", where_hash)
-
-    final_key = f"endpoint:contacts:{instance}:{where_hash}"
-    print("[contacts_cache_key] final_key:", final_key)
-
-    return final_key
\ No newline at end of file
+    return f"endpoint:contacts:{instance}:{where_hash}"
@@ -12,11 +12,52 @@ logger = logging.getLogger(__name__)
 T = TypeVar("T", bound=BaseModel)
 settings = get_settings()
 
+_http_client: Optional[httpx.AsyncClient] = None
+
+def _build_http_client() -> httpx.AsyncClient:
+    settings = get_settings()
+    limits = httpx.Limits(
+        max_connections=settings.EVO_HTTP_MAX_CONNECTIONS,
+        max_keepalive_connections=settings.EVO_HTTP_MAX_KEEPALIVE_CONNECTIONS,
+        keepalive_expiry=settings.EVO_HTTP_KEEPALIVE_EXPIRY,
+    )
+    return httpx.AsyncClient(
+        timeout=settings.EVO_HTTP_TIMEOUT,
+        limits=limits,
+        http2=settings.EVO_HTTP2,
+    )
+
+async def start_http_client() -> httpx.AsyncClient:
+    """
+    Cria o httpx.AsyncClient compartilhado do worker (chamado no lifespan).
+    """
+    return get_http_client()
+
+async def close_http_client() -> None:
+    """
+    Fecha o client compartilhado e libera as conexões do pool.
+    """
+    global _http_client
+    if _http_client is not None:
+        await _http_client.aclose()
+        _http_client = None
+
+def get_http_client() -> httpx.AsyncClient:
+    """
+    Retorna o client compartilhado; cria sob demanda quando usado fora
+    do lifespan da aplicação (scripts, shell).
+    """
+    global _http_client
+    if _http_client is None or _http_client.is_closed:
+        _http_client = _build_http_client()
+    return _http_client
+
 class EvolutionService:
-    def __init__(self, timeout: float = 30.0) -> None:
+    def __init__(self, timeout: Optional[float] = None) -> None:
         settings = get_settings()
         self.server_url = settings.EVO_SERVER_URL
         self.api_key = settings.EVO_API_KEY
+        # None: vale o EVO_HTTP_TIMEOUT do client compartilhado
         self.timeout = timeout
 
         if not self.server_url or not self.api_key:
@@ -33,14 +74,14 @@ class EvolutionService:
         json: Optional[Dict[str, Any]] = None,
     ) -> Any:
         try:
-            async with httpx.AsyncClient(timeout=self.timeout) as client:
-                resp = await client.request(
-                    method=method,
-                    url=url,
-                    headers=self._headers(),
-                    params=params,
-                    json=json,
-                )
+            resp = await get_http_client().request(
+                method=method,
+                url=url,
+                headers=self._headers(),
+                params=params,
+                json=json,
+                timeout=self.timeout if self.timeout is not None else httpx.USE_CLIENT_DEFAULT,
+            )
             resp.raise_for_status()
             data = resp.json()
             return data if data is not None else []
@@ -116,6 +157,10 @@ class EvolutionService:
                     })
         return self._validate_list(items, EvoMessage)
 
+    async def send_text(self, instance: str, number: str, text: str) -> Any:
+        url = self._make_url(f"/message/sendText/{instance}")
+        return await self._request("POST", url, json={"number": number, "text": text})
+
     def _validate_list(self, data: List[dict], model: Type[T]) -> List[T]:
         try:
             return [model.model_validate(i) for i in data]
@@ -0,0 +1,115 @@
+import asyncio
+import json
+import logging
+import time
+from typing import Optional, Set, FrozenSet
+
+from redis.asyncio import Redis
+from src.services.evolution_service import EvolutionService
+
+logger = logging.getLogger(__name__)
+
+INSTANCES_KEY = "evo:instances"
+
+class InstanceRegistry:
+    """
+    Registro das instâncias da Evolution com TTL curto.
+
+    Ordem de consulta: memória do worker -> Redis -> Evolution (fetchInstances).
+    Quando o TTL local expira, o conjunto atual continua sendo servido e a
+    atualização roda em background. Um nome desconhecido invalida o registro
+    e força uma nova busca (limitada por miss_refresh_interval).
+    """
+    def __init__(
+        self,
+        redis_client: Redis,
+        ttl: int = 30,
+        miss_refresh_interval: float = 2.0,
+        redis_key: str = INSTANCES_KEY,
+    ) -> None:
+        self.redis = redis_client
+        self.ttl = ttl
+        self.miss_refresh_interval = miss_refresh_interval
+        self.redis_key = redis_key
+
+        self._names: Optional[FrozenSet[str]] = None
+        self._expires_at: float = 0.0
+        self._last_forced_refresh: float = 0.0
+        self._lock = asyncio.Lock()
+        self._background: Optional[asyncio.Task] = None
+
+    def _store_local(self, names: Set[str]) -> FrozenSet[str]:
+        self._names = frozenset(names)
+        self._expires_at = time.monotonic() + self.ttl
+        return self._names
+
+    def invalidate(self) -> None:
+        self._names = None
+        self._expires_at = 0.0
+
+    def prime(self, names: Set[str]) -> None:
+        """Atualiza o registro com uma lista já obtida da Evolution (ex.: /inboxes)."""
+        self._store_local(names)
+
+    async def _load_from_redis(self) -> Optional[Set[str]]:
+        try:
+            raw = await self.redis.get(self.redis_key)
+        except Exception as e:
+            logger.warning("InstanceRegistry: falha ao ler Redis: %s", e)
+            return None
+        if raw is None:
+            return None
+        try:
+            return set(json.loads(raw))
+        except (TypeError, ValueError):
+            return None
+
+    async def _load_from_evolution(self, evo: EvolutionService) -> Set[str]:
+        instances = await evo.fetch_instances()
+        names = {i.name for i in instances if i.name}
+        try:
+            await self.redis.setex(self.redis_key, self.ttl, json.dumps(sorted(names)))
+        except Exception as e:
+            logger.warning("InstanceRegistry: falha ao gravar Redis: %s", e)
+        return names
+
+    async def refresh(self, evo: EvolutionService, force: bool = False) -> FrozenSet[str]:
+        """
+        Recarrega o registro. Sem force, aproveita o valor do Redis quando
+        outro worker já o atualizou; com force, vai direto na Evolution.
+        """
+        async with self._lock:
+            if not force and self._names is not None and time.monotonic() < self._expires_at:
+                return self._names
+            names = None if force else await self._load_from_redis()
+            if names is None:
+                names = await self._load_from_evolution(evo)
+            return self._store_local(names)
+
+    def _refresh_in_background(self, evo: EvolutionService) -> None:
+        if self._background is not None and not self._background.done():
+            return
+        self._background = asyncio.create_task(self._background_refresh(evo))
+
+    async def _background_refresh(self, evo: EvolutionService) -> None:
+        try:
+            await self.refresh(evo)
+        except Exception as e:
+            logger.warning("InstanceRegistry: falha ao atualizar em background: %s", e)
+
+    async def names(self, evo: EvolutionService) -> FrozenSet[str]:
+        if self._names is not None:
+            if time.monotonic() >= self._expires_at:
+                self._refresh_in_background(evo)
+            return self._names
+        return await self.refresh(evo)
+
+    async def exists(self, name: str, evo: EvolutionService) -> bool:
+        if name in await self.names(evo):
+            return True
+        now = time.monotonic()
+        if now - self._last_forced_refresh < self.miss_refresh_interval:
+            return False
+        self._last_forced_refresh = now
+        self.invalidate()
+        return name in await self.refresh(evo, force=True)
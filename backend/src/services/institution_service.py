@@ -10,6 +10,23 @@ from fastapi.exceptions import HTTPException
 from fastapi import status
 from src.utils.prevent_deletion import can_delete_user
 from typing import Optional
+from src.utils.pagination import keyset_paginate, keyset_page
+from src.db.database import read_stickiness
+
+# Escopo de read-your-writes da listagem de instituições (todas as instituições)
+INSTITUTIONS_SCOPE = "institutions"
+
+# Colunas que o InstitutionModel expõe, na mesma ordem
+INSTITUTION_LIST_COLUMNS = (
+    Institution.id,
+    Institution.name,
+    Institution.email,
+    Institution.phone,
+    Institution.address,
+    Institution.cnpj,
+    Institution.created_at,
+    Institution.updated_at,
+)
 
 class InstitutionService:
     async def get_institution_by_email(self, email: str, session: AsyncSession):
@@ -27,17 +44,23 @@ class InstitutionService:
         new_institution = Institution(**institution_data)
         session.add(new_institution)
         await session.commit()
+        await read_stickiness.mark([INSTITUTIONS_SCOPE])
         return new_institution
     
     async def get_all_institutions(self, session: AsyncSession, limit: int = 50, offset: int = 0):
         statement = (
-            select(Institution)
-            .order_by(Institution.created_at.desc())
+            select(*INSTITUTION_LIST_COLUMNS)
+            .order_by(Institution.created_at.desc(), Institution.id.desc())
             .limit(limit)
             .offset(offset)
         )
         result = await session.execute(statement)
-        return result.scalars().all()
+        return result.all()
+
+    async def get_institutions_page(self, session: AsyncSession, limit: int = 50, cursor: Optional[str] = None) -> dict:
+        statement = keyset_paginate(select(*INSTITUTION_LIST_COLUMNS), Institution.created_at, Institution.id, cursor, limit)
+        result = await session.execute(statement)
+        return keyset_page(result.all(), limit)
     
     """
     async def get_user_for_update(self, user_uid: str, session: AsyncSession) -> Optional[User]:
@@ -0,0 +1,40 @@
+from fastapi import UploadFile
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.core.config import get_settings
+from src.models.message import MessageMedia
+from src.services.blob_store import get_blob_store, stream_upload
+from src.utils.file_utils import MAX_FILE_SIZE_BYTES
+
+settings = get_settings()
+blob_store = get_blob_store(settings.MEDIA_STORE, settings.MEDIA_LOCAL_ROOT)
+
+class MediaService:
+    async def save_upload(self, file: UploadFile, media_type: str, session: AsyncSession) -> MessageMedia:
+        """
+        Grava o arquivo no blob store em streaming e registra só os
+        metadados (tamanho, sha256, onde está) em message_media.
+        """
+        try:
+            blob = await stream_upload(
+                file,
+                blob_store,
+                session,
+                chunk_size=settings.MEDIA_CHUNK_SIZE,
+                max_bytes=MAX_FILE_SIZE_BYTES,
+            )
+            entity = MessageMedia(
+                media_name=file.filename,
+                media_type=media_type,
+                content_type=file.content_type,
+                size_bytes=blob.size,
+                sha256=blob.sha256,
+                storage=blob_store.name,
+                storage_key=blob.key,
+            )
+            session.add(entity)
+            await session.commit()
+        except Exception:
+            await session.rollback()
+            raise
+        return entity
@@ -0,0 +1,494 @@
+import asyncio
+import contextlib
+import random
+import time
+from typing import Any, List, NamedTuple, Optional, Sequence
+
+import structlog
+from fastapi import HTTPException
+from sqlalchemy import func, text, update
+from sqlalchemy.engine import make_url
+from sqlalchemy.ext.asyncio import async_sessionmaker
+from redis.asyncio import Redis
+
+from src.core.config import get_settings
+from src.core.metrics import metrics
+from src.db.database import SessionLocal
+from src.db.redis import redis_client
+from src.models.message import Message, MessageStatus, NIL_LANE
+from src.services.evolution_service import EvolutionService
+from src.services.outbound_sender import OutboundSender
+
+logger = structlog.get_logger(__name__)
+
+# Fila (lane) de uma mensagem: instância + lote; avulsas (batch_id nulo) formam a
+# lane nil da instância. A expressão é a mesma do índice ix_messages_due_lane.
+LANE_SQL = f"coalesce(batch_id, '{NIL_LANE}'::uuid)"
+
+# Reivindica um lote numa única ida ao banco, repartido entre as lanes:
+# - lanes: skip scan recursivo no ix_messages_due_lane, uma linha por
+#   (instância, lote) com mensagens agendadas, sem varrer a fila inteira;
+# - due: para cada lane, até :per_lane vencidas mais antigas (mesmo índice),
+#   com SKIP LOCKED para dispatchers concorrentes pegarem linhas diferentes;
+# - claimed: intercala as lanes (1ª de cada, 2ª de cada, ...), no máximo
+#   :per_instance por instância, até :batch_size.
+# Uma campanha grande leva então a sua parte e não ocupa o lote todo: avulsas e
+# outras instâncias entram já no ciclo seguinte. Linhas travadas no due e não
+# escolhidas são liberadas no commit logo em seguida.
+# O UPDATE volta às linhas pelo ctid: estão travadas desde o due, então o ctid
+# não muda até lá, e o Tid Scan poupa uma busca na PK por linha.
+# Os status vão literais (não como parâmetro) para o planner poder casar o
+# predicado do índice parcial também nos planos genéricos de prepared statements.
+# DUE_SQL é só a busca (e a trava) das linhas; benchmarks/due_queue.py a mede sozinha.
+DUE_SQL = f"""
+    WITH RECURSIVE lanes AS (
+        (SELECT instance, {LANE_SQL} AS lane
+           FROM messages
+          WHERE status = '{MessageStatus.SCHEDULED}'
+          ORDER BY instance, {LANE_SQL}
+          LIMIT 1)
+        UNION ALL
+        SELECT next.instance, next.lane
+          FROM lanes, LATERAL (
+                SELECT instance, {LANE_SQL} AS lane
+                  FROM messages
+                 WHERE status = '{MessageStatus.SCHEDULED}'
+                   AND (instance, {LANE_SQL}) > (lanes.instance, lanes.lane)
+                 ORDER BY instance, {LANE_SQL}
+                 LIMIT 1
+               ) AS next
+    ),
+    due AS (
+        SELECT picked.ctid, lanes.instance, picked.scheduled_at,
+               row_number() OVER (PARTITION BY lanes.instance, lanes.lane ORDER BY picked.scheduled_at) AS lane_rank
+          FROM lanes, LATERAL (
+                SELECT ctid, scheduled_at
+                  FROM messages
+                 WHERE status = '{MessageStatus.SCHEDULED}'
+                   AND instance = lanes.instance AND {LANE_SQL} = lanes.lane
+                   AND scheduled_at <= now()
+                 ORDER BY scheduled_at
+                 LIMIT :per_lane
+                   FOR UPDATE SKIP LOCKED
+               ) AS picked
+    ),
+    ranked AS (
+        SELECT ctid, lane_rank, scheduled_at,
+               row_number() OVER (PARTITION BY instance ORDER BY lane_rank, scheduled_at) AS instance_rank
+          FROM due
+    ),
+    claimed AS (
+        SELECT ctid
+          FROM ranked
+         WHERE instance_rank <= :per_instance
+         ORDER BY lane_rank, scheduled_at
+         LIMIT :batch_size
+    )
+"""
+
+CLAIM_SQL = text(f"""{DUE_SQL}
+    UPDATE messages AS m
+       SET status = '{MessageStatus.SENDING}', attempts = m.attempts + 1, updated_at = now()
+      FROM claimed
+     WHERE m.ctid = claimed.ctid
+ RETURNING m.id, m.jid, m.instance, m.content, m.batch_id, m.attempts
+""")
+
+# Linhas presas em "sending" além do lease (dispatcher morreu) voltam para a fila.
+# Fica fora do CLAIM_SQL para não transformar a consulta quente num OR (ix_messages_sending).
+RECLAIM_SQL = text(f"""
+    UPDATE messages
+       SET status = '{MessageStatus.SCHEDULED}', updated_at = now()
+     WHERE status = '{MessageStatus.SENDING}' AND updated_at < now() - make_interval(secs => :lease)
+""")
+
+# Renova o lease das linhas de um lote ainda em envio (heartbeat do _process).
+TOUCH_SQL = text(f"""
+    UPDATE messages
+       SET updated_at = now()
+     WHERE id = ANY(:ids) AND status = '{MessageStatus.SENDING}'
+""")
+
+# Erro transitório: volta para a fila com backoff (por linha, em executemany).
+# O trigger de UPDATE avisa o dispatcher do novo scheduled_at.
+RETRY_SQL = text(f"""
+    UPDATE messages
+       SET status = '{MessageStatus.SCHEDULED}', scheduled_at = now() + make_interval(secs => :delay),
+           error = :error, updated_at = now()
+     WHERE id = :id
+""")
+
+# Segundos até a próxima mensagem agendada, no relógio do banco (None com a fila vazia).
+NEXT_DUE_SQL = text(f"""
+    SELECT extract(epoch FROM min(scheduled_at) - now())
+      FROM messages
+     WHERE status = '{MessageStatus.SCHEDULED}'
+""")
+
+# Canal do trigger messages_notify_due (payload: segundos até o scheduled_at mais próximo).
+NOTIFY_CHANNEL = "messages_due"
+
+# Respostas da Evolution que valem nova tentativa; os demais 4xx são definitivos.
+RETRYABLE_STATUS = {408, 425, 429}
+
+class SendFailure(NamedTuple):
+    error: str
+    retry: bool
+
+def is_transient(exc: Exception) -> bool:
+    """
+    429, timeouts e 5xx (o EvolutionService converte falhas de rede em 503)
+    são transitórios; erros fora do HTTP também, na dúvida.
+    """
+    if isinstance(exc, HTTPException):
+        return exc.status_code in RETRYABLE_STATUS or exc.status_code >= 500
+    return True
+
+class MessageDispatcher:
+    """
+    Envia as mensagens agendadas (messages.scheduled_at) pela Evolution.
+
+    Cada ciclo reivindica até batch_size mensagens vencidas (status
+    scheduled -> sending, commit imediato), repartidas entre as lanes
+    (instância, lote) e com no máximo claim_per_instance por instância
+    (CLAIM_SQL); envia pelo OutboundSender
+    (ritmo e concorrência por instância) fora de qualquer transação e
+    grava o resultado em lote (sent/failed). Até max_batches lotes ficam
+    em andamento ao mesmo tempo, para uma instância lenta não travar as
+    outras. Vários dispatchers (workers ou processos) podem rodar juntos:
+    cada linha é reivindicada por um só, e o ritmo e as vagas por instância
+    são somados entre eles pelo Redis (redis_client). A entrega é at-least-once: se o
+    processo cair entre o envio e a gravação do resultado, a mensagem
+    volta para a fila após o lease (verificado a cada reclaim_interval
+    segundos). Enquanto o lote anda, um heartbeat renova o updated_at das
+    linhas dele a cada lease_seconds / 3 até o resultado ser gravado, então
+    a espera no ritmo da instância não faz o lote voltar para a fila no
+    meio do envio.
+    Além disso claim_per_instance fica limitado a
+    send_rate_per_second * lease_seconds / (2 * max_batches): mesmo sem
+    heartbeat, o que este processo segura de uma instância sai na metade
+    do lease. Configurações em que nem uma mensagem por instância cabe
+    nessa conta são recusadas (ValueError).
+
+    Erros transitórios (is_transient) reagendam a mensagem com backoff
+    exponencial (retry_backoff * 2^(tentativa-1), até retry_backoff_max,
+    com jitter) até max_attempts reivindicações; depois disso, e em
+    qualquer outro 4xx, a mensagem fica failed.
+
+    Sem trabalho, dorme até o próximo scheduled_at. Com listen_dsn, escuta
+    o NOTIFY do trigger de messages numa conexão asyncpg dedicada e acorda
+    antes quando chega algo mais cedo; nesse caso o poll de segurança é
+    idle_poll_interval. Sem LISTEN (ou com a conexão caída) o poll volta a
+    ser poll_interval.
+    """
+    def __init__(
+        self,
+        session_factory: async_sessionmaker = SessionLocal,
+        evo: Optional[EvolutionService] = None,
+        batch_size: int = 50,
+        max_batches: int = 4,
+        claim_per_instance: Optional[int] = None,
+        send_rate_per_second: float = 1.0,
+        send_burst: int = 5,
+        send_max_in_flight: int = 2,
+        send_slot_ttl: float = 60.0,
+        redis_client: Optional[Redis] = None,
+        poll_interval: float = 1.0,
+        lease_seconds: int = 300,
+        reclaim_interval: float = 60.0,
+        listen_dsn: Optional[str] = None,
+        idle_poll_interval: float = 30.0,
+        max_attempts: int = 5,
+        retry_backoff: float = 30.0,
+        retry_backoff_max: float = 3600.0,
+    ) -> None:
+        self.session_factory = session_factory
+        self.evo = evo
+        self.batch_size = batch_size
+        self.max_batches = max_batches
+        # até max_batches lotes da mesma instância dividem o ritmo dela
+        lease_capacity = int(send_rate_per_second * lease_seconds / (2 * max_batches))
+        if lease_capacity < 1:
+            raise ValueError(
+                f"Lease de {lease_seconds}s curto demais para {send_rate_per_second}/s por instância "
+                f"com {max_batches} lotes simultâneos (mínimo {2 * max_batches / send_rate_per_second:.0f}s)."
+            )
+        self.claim_per_instance = min(claim_per_instance or batch_size, batch_size, lease_capacity)
+        # uma lane nunca leva mais que a instância dela
+        self.claim_per_lane = self.claim_per_instance
+        self.sender = OutboundSender(
+            self._send_row,
+            rate_per_second=send_rate_per_second,
+            burst=send_burst,
+            max_in_flight=send_max_in_flight,
+            redis_client=redis_client,
+            slot_ttl=send_slot_ttl,
+        )
+        self.poll_interval = poll_interval
+        self.lease_seconds = lease_seconds
+        self.reclaim_interval = reclaim_interval
+        self._next_reclaim = 0.0
+        self.listen_dsn = listen_dsn
+        self.idle_poll_interval = idle_poll_interval
+        self.max_attempts = max_attempts
+        self.retry_backoff = retry_backoff
+        self.retry_backoff_max = retry_backoff_max
+        self._listening = False
+        self._wakeup = asyncio.Event()
+        self._wake_at = 0.0
+
+        self.claimed = metrics.counter("dispatcher.claimed")
+        self.sent = metrics.counter("dispatcher.sent")
+        self.failed = metrics.counter("dispatcher.failed")
+        self.retried = metrics.counter("dispatcher.retried")
+        self.reclaimed = metrics.counter("dispatcher.reclaimed")
+        self.notifications = metrics.counter("dispatcher.notifications")
+        self.batch_latency = metrics.timer("dispatcher.batch")
+
+    async def claim_batch(self) -> Sequence[Any]:
+        async with self.session_factory() as session:
+            result = await session.execute(CLAIM_SQL, {
+                "batch_size": self.batch_size,
+                "per_lane": self.claim_per_lane,
+                "per_instance": self.claim_per_instance,
+            })
+            rows = result.all()
+            await session.commit()
+        self.claimed.inc(len(rows))
+        return rows
+
+    async def reclaim_expired(self) -> int:
+        async with self.session_factory() as session:
+            result = await session.execute(RECLAIM_SQL, {"lease": float(self.lease_seconds)})
+            await session.commit()
+        self.reclaimed.inc(result.rowcount)
+        return result.rowcount
+
+    async def _send_row(self, row: Any) -> Any:
+        return await self.evo.send_text(instance=row.instance, number=row.jid, text=row.content)
+
+    async def _send(self, row: Any) -> Optional[SendFailure]:
+        """Retorna None em caso de sucesso ou o erro e se vale nova tentativa."""
+        try:
+            # cada lote (campanha) é uma fila própria na instância; avulsas ficam na fila None
+            await self.sender.submit(row.instance, row, lane=row.batch_id)
+            return None
+        except HTTPException as e:
+            return SendFailure(str(e.detail)[:1000], is_transient(e))
+        except Exception as e:
+            logger.exception("dispatcher.send_error", message_id=str(row.id))
+            return SendFailure(str(e)[:1000], is_transient(e))
+
+    def retry_delay(self, attempts: int) -> float:
+        # jitter: um 429 em rajada não volta todo no mesmo instante
+        delay = self.retry_backoff * 2 ** max(attempts - 1, 0) * random.uniform(1.0, 1.25)
+        return min(delay, self.retry_backoff_max)
+
+    async def _store_results(self, rows: Sequence[Any], results: List[Optional[SendFailure]]) -> None:
+        sent_ids = []
+        retries = []
+        failures = []
+        for row, failure in zip(rows, results):
+            if failure is None:
+                sent_ids.append(row.id)
+            elif failure.retry and row.attempts < self.max_attempts:
+                retries.append({"id": row.id, "error": failure.error, "delay": self.retry_delay(row.attempts)})
+            else:
+                failures.append({"id": row.id, "status": MessageStatus.FAILED, "error": failure.error})
+        async with self.session_factory() as session:
+            if sent_ids:
+                await session.execute(
+                    update(Message)
+                    .where(Message.id.in_(sent_ids))
+                    .values(status=MessageStatus.SENT, sent_at=func.now(), error=None)
+                )
+            if retries:
+                await session.execute(RETRY_SQL, retries)
+            if failures:
+                # UPDATE em lote por chave primária (executemany)
+                await session.execute(update(Message), failures)
+            await session.commit()
+        self.sent.inc(len(sent_ids))
+        self.retried.inc(len(retries))
+        self.failed.inc(len(failures))
+
+    async def _claim(self) -> Sequence[Any]:
+        if time.monotonic() >= self._next_reclaim:
+            self._next_reclaim = time.monotonic() + self.reclaim_interval
+            await self.reclaim_expired()
+        return await self.claim_batch()
+
+    async def _heartbeat(self, ids: List[Any]) -> None:
+        while True:
+            await asyncio.sleep(self.lease_seconds / 3)
+            try:
+                async with self.session_factory() as session:
+                    await session.execute(TOUCH_SQL, {"ids": ids})
+                    await session.commit()
+            except Exception as e:
+                # a próxima volta tenta de novo; o lease ainda tem 2/3 pela frente
+                logger.warning("dispatcher.heartbeat_error", error=str(e))
+
+    async def _process(self, rows: Sequence[Any]) -> None:
+        started = time.perf_counter()
+        # até o resultado ser gravado: quem terminou cedo também espera o resto do lote
+        heartbeat = asyncio.create_task(self._heartbeat([row.id for row in rows]))
+        try:
+            results = await asyncio.gather(*(self._send(row) for row in rows))
+            await self._store_results(rows, list(results))
+        finally:
+            heartbeat.cancel()
+            with contextlib.suppress(asyncio.CancelledError):
+                await heartbeat
+        self.batch_latency.observe(time.perf_counter() - started)
+
+    async def dispatch_once(self) -> int:
+        """Processa um lote até o fim; retorna quantas mensagens foram reivindicadas."""
+        rows = await self._claim()
+        if rows:
+            await self._process(rows)
+        return len(rows)
+
+    def _wake_in(self, seconds: float) -> None:
+        """Antecipa o próximo ciclo se `seconds` vence antes do que já está agendado."""
+        wake_at = asyncio.get_running_loop().time() + max(seconds, 0.0)
+        if wake_at < self._wake_at:
+            self._wake_at = wake_at
+            self._wakeup.set()
+
+    def _on_notify(self, connection: Any, pid: int, channel: str, payload: str) -> None:
+        self.notifications.inc()
+        try:
+            self._wake_in(float(payload))
+        except ValueError:
+            self._wake_in(0.0)
+
+    async def _listen(self, retry_interval: float = 5.0) -> None:
+        import asyncpg
+
+        while True:
+            connection = None
+            try:
+                connection = await asyncpg.connect(self.listen_dsn)
+                closed = asyncio.Event()
+                connection.add_termination_listener(lambda _: closed.set())
+                await connection.add_listener(NOTIFY_CHANNEL, self._on_notify)
+                self._listening = True
+                # notificações podem ter se perdido enquanto estava desconectado
+                self._wake_in(0.0)
+                await closed.wait()
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.warning("dispatcher.listen_error", error=str(e))
+            finally:
+                self._listening = False
+                if connection is not None and not connection.is_closed():
+                    await connection.close()
+            await asyncio.sleep(retry_interval)
+
+    async def _seconds_until_next_due(self) -> Optional[float]:
+        async with self.session_factory() as session:
+            seconds = (await session.execute(NEXT_DUE_SQL)).scalar()
+        return float(seconds) if seconds is not None else None
+
+    async def _sleep_until_due(self) -> None:
+        loop = asyncio.get_running_loop()
+        fallback = self.idle_poll_interval if self._listening else self.poll_interval
+        # notificações que chegarem durante a consulta abaixo já baixam o _wake_at
+        self._wake_at = loop.time() + fallback
+        self._wakeup.clear()
+        try:
+            seconds = await self._seconds_until_next_due()
+        except Exception as e:
+            logger.warning("dispatcher.next_due_error", error=str(e))
+            seconds = self.poll_interval
+        if seconds is not None:
+            self._wake_in(seconds)
+        while (remaining := self._wake_at - loop.time()) > 0:
+            self._wakeup.clear()
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), timeout=remaining)
+            except asyncio.TimeoutError:
+                pass
+
+    async def _process_in_slot(self, rows: Sequence[Any], slots: asyncio.Semaphore) -> None:
+        try:
+            await self._process(rows)
+        except Exception as e:
+            logger.warning("dispatcher.batch_error", error=str(e))
+        finally:
+            slots.release()
+
+    async def run(self) -> None:
+        if self.evo is None:
+            self.evo = EvolutionService()
+        listener = asyncio.create_task(self._listen()) if self.listen_dsn else None
+        slots = asyncio.Semaphore(self.max_batches)
+        batches: set = set()
+        logger.info("dispatcher.started", batch_size=self.batch_size, max_batches=self.max_batches, listen=bool(listener))
+        try:
+            while True:
+                await slots.acquire()
+                try:
+                    rows = await self._claim()
+                except asyncio.CancelledError:
+                    slots.release()
+                    raise
+                except Exception as e:
+                    slots.release()
+                    logger.warning("dispatcher.cycle_error", error=str(e))
+                    await asyncio.sleep(self.poll_interval)
+                    continue
+                if rows:
+                    task = asyncio.create_task(self._process_in_slot(rows, slots))
+                    batches.add(task)
+                    task.add_done_callback(batches.discard)
+                else:
+                    slots.release()
+                # lote cheio: provavelmente há mais mensagens vencidas, segue sem dormir
+                if len(rows) < self.batch_size:
+                    await self._sleep_until_due()
+        finally:
+            for task in [*batches, listener]:
+                if task is not None:
+                    task.cancel()
+                    with contextlib.suppress(asyncio.CancelledError):
+                        await task
+
+def build_dispatcher() -> MessageDispatcher:
+    settings = get_settings()
+    return MessageDispatcher(
+        batch_size=settings.DISPATCHER_BATCH_SIZE,
+        max_batches=settings.DISPATCHER_MAX_BATCHES,
+        claim_per_instance=settings.DISPATCHER_CLAIM_PER_INSTANCE,
+        send_rate_per_second=settings.SEND_RATE_PER_SECOND,
+        send_burst=settings.SEND_BURST,
+        send_max_in_flight=settings.SEND_MAX_IN_FLIGHT,
+        send_slot_ttl=settings.SEND_SLOT_TTL,
+        redis_client=redis_client,
+        poll_interval=settings.DISPATCHER_POLL_INTERVAL,
+        lease_seconds=settings.DISPATCHER_LEASE_SECONDS,
+        listen_dsn=(
+            make_url(settings.SQLALCHEMY_DATABASE_URL).set(drivername="postgresql").render_as_string(hide_password=False)
+            if settings.DISPATCHER_LISTEN else None
+        ),
+        idle_poll_interval=settings.DISPATCHER_IDLE_POLL_INTERVAL,
+        max_attempts=settings.DISPATCHER_MAX_ATTEMPTS,
+        retry_backoff=settings.DISPATCHER_RETRY_BACKOFF,
+        retry_backoff_max=settings.DISPATCHER_RETRY_BACKOFF_MAX,
+    )
+
+async def _run_standalone() -> None:
+    from src.db.database import engine
+    from src.services.evolution_service import close_http_client
+
+    try:
+        await build_dispatcher().run()
+    finally:
+        await close_http_client()
+        await engine.dispose()
+
+if __name__ == "__main__":
+    # processo dedicado: cd backend && python -m src.services.message_dispatcher
+    asyncio.run(_run_standalone())
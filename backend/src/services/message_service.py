@@ -0,0 +1,80 @@
+import csv
+import io
+import uuid
+from typing import List, Sequence
+
+from pydantic import TypeAdapter, ValidationError
+from sqlalchemy import insert
+from sqlalchemy.ext.asyncio import AsyncSession
+from fastapi.exceptions import HTTPException
+from fastapi import status
+
+from src.models.message import Message, MessageStatus
+from src.schemas.message_schemas import MessageScheduleModel
+
+MAX_REPORTED_ERRORS = 20
+COPY_COLUMNS = ("id", "jid", "instance", "content", "media", "scheduled_at", "status", "batch_id")
+CSV_FIELDS = ("jid", "instance", "content", "scheduled_at")
+
+schedule_list_adapter = TypeAdapter(List[MessageScheduleModel])
+
+def _invalid(errors: list) -> HTTPException:
+    return HTTPException(
+        status_code=status.HTTP_422_UNPROCESSABLE_CONTENT,
+        detail={
+            "message": "Invalid messages in batch",
+            "error_code": "invalid_batch",
+            "errors": errors[:MAX_REPORTED_ERRORS],
+        },
+    )
+
+def parse_json_batch(body: bytes) -> List[MessageScheduleModel]:
+    """Valida o array JSON inteiro de uma vez no pydantic-core (sem json.loads intermediário)."""
+    try:
+        return schedule_list_adapter.validate_json(body)
+    except ValidationError as e:
+        raise _invalid(e.errors(include_url=False, include_input=False, include_context=False))
+
+def parse_csv_batch(body: bytes) -> List[MessageScheduleModel]:
+    """CSV com cabeçalho jid,instance,content,scheduled_at (ISO 8601 com fuso)."""
+    try:
+        reader = csv.DictReader(io.StringIO(body.decode("utf-8-sig")))
+    except UnicodeDecodeError:
+        raise _invalid([{"loc": ["body"], "msg": "CSV must be UTF-8", "type": "encoding"}])
+    missing = [field for field in CSV_FIELDS if field not in (reader.fieldnames or [])]
+    if missing:
+        raise _invalid([{"loc": ["header", field], "msg": "Missing column", "type": "missing"} for field in missing])
+    try:
+        return schedule_list_adapter.validate_python(list(reader))
+    except ValidationError as e:
+        raise _invalid(e.errors(include_url=False, include_input=False, include_context=False))
+
+class MessageService:
+    async def schedule_bulk(self, messages: Sequence[MessageScheduleModel], session: AsyncSession) -> uuid.UUID:
+        """
+        Insere o lote inteiro com um COPY (copy_records_to_table do asyncpg)
+        na transação da sessão; sem asyncpg, cai num INSERT multi-linha.
+        Todas as linhas recebem o mesmo batch_id, que o dispatcher usa como
+        fila própria ao intercalar campanhas.
+        """
+        batch_id = uuid.uuid4()
+        records = [
+            (uuid.uuid4(), m.jid, m.instance, m.content, False, m.scheduled_at, MessageStatus.SCHEDULED, batch_id)
+            for m in messages
+        ]
+        try:
+            connection = await session.connection()
+            raw = await connection.get_raw_connection()
+            driver = raw.driver_connection
+            if hasattr(driver, "copy_records_to_table"):
+                await driver.copy_records_to_table(Message.__tablename__, records=records, columns=COPY_COLUMNS)
+            else:
+                await session.execute(
+                    insert(Message.__table__),
+                    [dict(zip(COPY_COLUMNS, record)) for record in records],
+                )
+            await session.commit()
+        except Exception:
+            await session.rollback()
+            raise
+        return batch_id
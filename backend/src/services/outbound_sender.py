@@ -0,0 +1,228 @@
+import asyncio
+import time
+from collections import OrderedDict, deque
+from typing import Any, Awaitable, Callable, Deque, Dict, Hashable, Optional
+from uuid import uuid4
+
+import structlog
+from redis.asyncio import Redis
+
+from src.core.metrics import metrics
+from src.core.middleware import LocalTokenBucket, RateLimiter
+
+logger = structlog.get_logger(__name__)
+
+SendFunc = Callable[[Any], Awaitable[Any]]
+
+# Semáforo por instância no Redis: um ZSET de vagas (token -> validade em ms).
+# Vagas vencidas (processo que morreu no meio do envio) são descartadas antes
+# de contar, então o limite se recupera sozinho depois de slot_ttl.
+# KEYS[1] = send:slots:<instância>; ARGV[1] = limite; ARGV[2] = slot_ttl (ms); ARGV[3] = token
+ACQUIRE_SLOT_SCRIPT = """
+local t = redis.call('TIME')
+local now = tonumber(t[1]) * 1000 + math.floor(tonumber(t[2]) / 1000)
+redis.call('ZREMRANGEBYSCORE', KEYS[1], '-inf', now)
+if redis.call('ZCARD', KEYS[1]) >= tonumber(ARGV[1]) then
+    return 0
+end
+redis.call('ZADD', KEYS[1], now + tonumber(ARGV[2]), ARGV[3])
+redis.call('PEXPIRE', KEYS[1], ARGV[2])
+return 1
+"""
+
+class InstanceLimits:
+    """
+    Ritmo e concorrência por instância, compartilhados por todos os
+    processos que enviam (dispatcher em cada worker do uvicorn e
+    dispatchers avulsos):
+
+    - ritmo: GCRA no Redis (o mesmo RateLimiter das rotas, chave
+      send:<instância>), com um LocalTokenBucket da mesma taxa na frente:
+      bucket local vazio já basta para esperar, sem round-trip;
+    - concorrência: no máximo max_in_flight vagas por instância no
+      ACQUIRE_SLOT_SCRIPT, cada uma válida por slot_ttl segundos (deve
+      cobrir o timeout do envio).
+
+    Sem redis_client, ou com o Redis fora do ar, os limites valem só para
+    este processo (send.limits_fallback em /metrics); depois de uma falha o
+    Redis fica de fora por redis_retry_interval segundos, para cada envio
+    não pagar o timeout de conexão.
+    """
+    def __init__(
+        self,
+        redis_client: Optional[Redis],
+        rate_per_second: float,
+        burst: int,
+        max_in_flight: int,
+        slot_ttl: float = 60.0,
+        slot_poll_interval: float = 0.05,
+        redis_retry_interval: float = 5.0,
+    ) -> None:
+        self.redis = redis_client
+        self.max_in_flight = max_in_flight
+        self.slot_ttl_ms = int(slot_ttl * 1000)
+        self.slot_poll_interval = slot_poll_interval
+        self.local = LocalTokenBucket(capacity=burst, refill_per_second=rate_per_second)
+        self.limiter = (
+            RateLimiter(redis_client, max_requests=burst, window=burst / rate_per_second)
+            if redis_client is not None else None
+        )
+        self._acquire_slot = redis_client.register_script(ACQUIRE_SLOT_SCRIPT) if redis_client is not None else None
+        self.redis_retry_interval = redis_retry_interval
+        self._redis_down_until = 0.0
+        self.fallbacks = metrics.counter("send.limits_fallback")
+
+    def _use_redis(self) -> bool:
+        return self.redis is not None and time.monotonic() >= self._redis_down_until
+
+    def _fallback(self, action: str, error: Exception) -> None:
+        self.fallbacks.inc()
+        self._redis_down_until = time.monotonic() + self.redis_retry_interval
+        logger.warning("send.limits_fallback", action=action, error=str(error))
+
+    async def wait_for_token(self, instance: str) -> None:
+        while True:
+            wait = self.local.try_acquire(instance)
+            if wait:
+                await asyncio.sleep(wait)
+                continue
+            if not self._use_redis():
+                return
+            try:
+                result = await self.limiter.check(f"send:{instance}")
+            except Exception as e:
+                self._fallback("rate", e)
+                return
+            if result.allowed:
+                return
+            # outro processo gastou a vez: devolve o token local e espera o GCRA
+            self.local.refund(instance)
+            await asyncio.sleep(max(result.retry_after, 0.001))
+
+    async def acquire_slot(self, instance: str) -> Optional[str]:
+        """Espera uma vaga global; retorna o token dela (None sem Redis)."""
+        if not self._use_redis():
+            return None
+        token = uuid4().hex
+        while True:
+            try:
+                acquired = await self._acquire_slot(
+                    keys=[f"send:slots:{instance}"], args=[self.max_in_flight, self.slot_ttl_ms, token]
+                )
+            except Exception as e:
+                self._fallback("slot", e)
+                return None
+            if acquired:
+                return token
+            await asyncio.sleep(self.slot_poll_interval)
+
+    async def release_slot(self, instance: str, token: Optional[str]) -> None:
+        if token is None:
+            return
+        try:
+            await self.redis.zrem(f"send:slots:{instance}", token)
+        except Exception as e:
+            # a vaga expira sozinha em slot_ttl
+            self._fallback("release", e)
+
+class InstanceQueue:
+    """
+    Fila de envios de uma instância da Evolution.
+
+    Cada lote (campanha) tem sua própria fila e envios avulsos ficam na
+    fila `None`; o pump atende as filas em round-robin, então uma campanha
+    de 100k mensagens não segura as avulsas nem as outras campanhas.
+    Antes de cada envio pega uma vaga (local e global) e espera um token
+    do ritmo da instância (InstanceLimits).
+    """
+    def __init__(self, instance: str, limits: InstanceLimits, send: SendFunc) -> None:
+        self.instance = instance
+        self.limits = limits
+        self.send = send
+        self.semaphore = asyncio.Semaphore(limits.max_in_flight)
+        self.lanes: "OrderedDict[Hashable, Deque[tuple]]" = OrderedDict()
+        self.depth = 0
+        self.in_flight = 0
+        self.latency = metrics.timer(f"send.{instance}.latency")
+        self._pump: Optional[asyncio.Task] = None
+        self._tasks: set = set()
+
+    def submit(self, item: Any, lane: Hashable = None) -> asyncio.Future:
+        future = asyncio.get_running_loop().create_future()
+        self.lanes.setdefault(lane, deque()).append((item, future))
+        self.depth += 1
+        if self._pump is None or self._pump.done():
+            self._pump = asyncio.create_task(self._run())
+        return future
+
+    def _next(self) -> tuple:
+        # round-robin: pega da primeira fila e a manda para o fim
+        lane, items = next(iter(self.lanes.items()))
+        item = items.popleft()
+        self.lanes.move_to_end(lane)
+        if not items:
+            del self.lanes[lane]
+        self.depth -= 1
+        return item
+
+    async def _run(self) -> None:
+        while self.lanes:
+            await self.semaphore.acquire()
+            slot = await self.limits.acquire_slot(self.instance)
+            await self.limits.wait_for_token(self.instance)
+            if not self.lanes:
+                await self.limits.release_slot(self.instance, slot)
+                self.semaphore.release()
+                break
+            item, future = self._next()
+            task = asyncio.create_task(self._send(item, future, slot))
+            self._tasks.add(task)
+            task.add_done_callback(self._tasks.discard)
+
+    async def _send(self, item: Any, future: asyncio.Future, slot: Optional[str]) -> None:
+        self.in_flight += 1
+        started = time.perf_counter()
+        try:
+            result = await self.send(item)
+        except Exception as e:
+            if not future.done():
+                future.set_exception(e)
+        else:
+            if not future.done():
+                future.set_result(result)
+        finally:
+            self.latency.observe(time.perf_counter() - started)
+            self.in_flight -= 1
+            self.semaphore.release()
+            await self.limits.release_slot(self.instance, slot)
+
+class OutboundSender:
+    """
+    Envio de mensagens com controle por instância (Message.instance):
+    ritmo (rate_per_second, burst) e no máximo max_in_flight requisições
+    simultâneas, somando todos os processos que usam o mesmo Redis
+    (InstanceLimits). Instâncias diferentes andam em paralelo.
+    A profundidade das filas e os envios em andamento deste processo
+    aparecem em /metrics (send.queue_depth, send.in_flight) e a latência
+    em send.<instância>.latency.
+    """
+    def __init__(
+        self,
+        send: SendFunc,
+        rate_per_second: float,
+        burst: int,
+        max_in_flight: int,
+        redis_client: Optional[Redis] = None,
+        slot_ttl: float = 60.0,
+    ) -> None:
+        self.send = send
+        self.limits = InstanceLimits(redis_client, rate_per_second, burst, max_in_flight, slot_ttl=slot_ttl)
+        self.queues: Dict[str, InstanceQueue] = {}
+        metrics.gauge("send.queue_depth", lambda: {name: q.depth for name, q in self.queues.items()})
+        metrics.gauge("send.in_flight", lambda: {name: q.in_flight for name, q in self.queues.items()})
+
+    def submit(self, instance: str, item: Any, lane: Hashable = None) -> asyncio.Future:
+        queue = self.queues.get(instance)
+        if queue is None:
+            queue = self.queues[instance] = InstanceQueue(instance, self.limits, self.send)
+        return queue.submit(item, lane)
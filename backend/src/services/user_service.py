@@ -2,13 +2,52 @@ from sqlalchemy.ext.asyncio import AsyncSession
 from src.models.user import User
 from sqlalchemy import select, update
 from src.schemas.user_schemas import UserCreateModel, UserModel, UserProfileChange
-from src.utils.password_verify import generate_password_hash
+from src.utils.password_verify import generate_password_hash_async, needs_rehash, password_pool
 from sqlalchemy.future import select
 from sqlalchemy.exc import IntegrityError
 from src.utils.prevent_deletion import can_delete_user
 from typing import Optional
 from src.core.erros import UserDeleteConflictError, UserCreateError
 from httpx import _status_codes
+from src.services.cache_service import CacheService, local_cache, user_tag, institution_tag
+from src.db.redis import redis_client
+from src.db.database import SessionLocal, read_stickiness
+from src.core.erros import PasswordHashingUnavailable
+from src.core.metrics import metrics
+from src.utils.pagination import keyset_paginate, keyset_page
+import structlog
+
+logger = structlog.get_logger(__name__)
+rehash_counter = metrics.counter("password.rehash")
+rehash_skipped_counter = metrics.counter("password.rehash_skipped")
+
+cache_service = CacheService(redis_client=redis_client, local_cache=local_cache)
+
+# Colunas que o UserModel expõe: as listagens não carregam password_hash nem montam entidades ORM
+USER_LIST_COLUMNS = (
+    User.id,
+    User.username,
+    User.email,
+    User.first_name,
+    User.last_name,
+    User.is_verified,
+    User.created_at,
+    User.updated_at,
+    User.role,
+    User.institution_id,
+)
+
+async def written(*tags: str) -> None:
+    """
+    Depois do commit de uma escrita: os escopos alterados passam a ler do
+    primário (read-your-writes) antes de o cache deles ser invalidado, para
+    a próxima carga não recachear dados atrasados da réplica.
+    """
+    await read_stickiness.mark(tags)
+    await cache_service.invalidate_tags(*tags)
+
+def users_listing_statement(institution_id):
+    return select(*USER_LIST_COLUMNS).where(User.institution_id == institution_id)
 
 class UserService:
     async def get_user_by_email(self, email: str, session: AsyncSession):
@@ -17,6 +56,36 @@ class UserService:
         user = result.scalars().first()
         return user
     
+    async def rehash_password(self, user_id, old_hash: str, password: str) -> None:
+        """
+        Regrava o hash da senha com os parâmetros atuais do argon2.
+        Roda após a resposta do login, com sessão própria, e só usa o pool
+        quando há worker ocioso (logins têm prioridade). O UPDATE é
+        condicionado ao hash antigo para não sobrescrever uma troca de senha
+        concorrente. Se não der agora, tenta de novo no próximo login.
+        """
+        if not needs_rehash(old_hash):
+            return
+        if not password_pool.idle:
+            rehash_skipped_counter.inc()
+            return
+        try:
+            new_hash = await generate_password_hash_async(password)
+        except PasswordHashingUnavailable:
+            rehash_skipped_counter.inc()
+            return
+        try:
+            async with SessionLocal() as session:
+                await session.execute(
+                    update(User)
+                    .where(User.id == user_id, User.password_hash == old_hash)
+                    .values(password_hash=new_hash)
+                )
+                await session.commit()
+            rehash_counter.inc()
+        except Exception as e:
+            logger.warning("password.rehash_failed", user_id=str(user_id), error=str(e))
+
     async def user_exist(self, email: str, session: AsyncSession):
         user = await self.get_user_by_email(email=email, session=session)
         return True if user is not None else False
@@ -27,30 +96,38 @@ class UserService:
 
         new_user = User(
             **user_data_dict,
-            password_hash=generate_password_hash(password)
+            password_hash=await generate_password_hash_async(password)
         )
         try:
             session.add(new_user)
             await session.commit()
-            return new_user
         except Exception as e:
             await session.rollback()
             raise UserCreateError(
             status_code=500,
             detail={"message": f"Internal database error: {e}", "error_code": "db_error"}
         )
+        await written(institution_tag(new_user.institution_id))
+        return new_user
     
     async def get_all_users(self, current_user: User, session: AsyncSession, limit: int = 50, offset: int = 0):
         statement = (
-            select(User)
-            .where(User.institution_id == current_user.institution_id)
-            .order_by(User.created_at.desc())
+            users_listing_statement(current_user.institution_id)
+            .order_by(User.created_at.desc(), User.id.desc())
             .limit(limit)
             .offset(offset)
         )
         result = await session.execute(statement)
-        return result.scalars().all()
+        return result.all()
     
+    async def get_users_page(self, current_user: User, session: AsyncSession, limit: int = 50, cursor: Optional[str] = None) -> dict:
+        statement = keyset_paginate(
+            users_listing_statement(current_user.institution_id),
+            User.created_at, User.id, cursor, limit,
+        )
+        result = await session.execute(statement)
+        return keyset_page(result.all(), limit)
+
     async def get_user_for_update(self, user_uid: str, session: AsyncSession) -> Optional[User]:
         statement = (select(User).where(User.id == user_uid).with_for_update())
         result = await session.execute(statement=statement)
@@ -71,6 +148,7 @@ class UserService:
         result = await session.execute(statement=statement)
         updated_entity = result.scalar_one()
         await session.commit()
+        await written(user_tag(current_user.id), institution_tag(current_user.institution_id))
         return UserModel.model_validate(updated_entity, from_attributes=True)
     
     async def delete_user(self, current_user: User, user_uid: str, session: AsyncSession):
@@ -78,10 +156,12 @@ class UserService:
         if not user_to_deleted:
             return False
         can_delete_user(current_user=current_user, user_to_deleted=user_to_deleted)
+        institution_id = user_to_deleted.institution_id
         try:
             await session.delete(user_to_deleted)
             await session.commit()
-            return True
         except IntegrityError:
             await session.rollback()
-            raise UserDeleteConflictError()
\ No newline at end of file
+            raise UserDeleteConflictError()
+        await written(user_tag(user_uid), institution_tag(institution_id))
+        return True
\ No newline at end of file
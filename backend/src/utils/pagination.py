@@ -0,0 +1,42 @@
+import base64
+import binascii
+import uuid
+from datetime import datetime
+from typing import Any, List, Optional, Sequence, Tuple
+from sqlalchemy import Select, tuple_
+from src.core.erros import InvalidCursor
+
+def encode_cursor(created_at: datetime, id: uuid.UUID) -> str:
+    """Cursor opaco com a posição (created_at, id) do último item da página."""
+    raw = f"{created_at.isoformat()}|{id}".encode("utf-8")
+    return base64.urlsafe_b64encode(raw).decode("ascii").rstrip("=")
+
+def decode_cursor(cursor: str) -> Tuple[datetime, uuid.UUID]:
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        created_at, id = base64.urlsafe_b64decode(padded).decode("utf-8").split("|", 1)
+        return datetime.fromisoformat(created_at), uuid.UUID(id)
+    except (binascii.Error, UnicodeDecodeError, ValueError):
+        raise InvalidCursor()
+
+def keyset_paginate(statement: Select, created_at_column: Any, id_column: Any, cursor: Optional[str], limit: int) -> Select:
+    """
+    Ordena por (created_at DESC, id DESC) e, com cursor, continua a partir
+    dele com uma comparação de tupla, que o Postgres resolve como range no
+    índice em vez de descartar as linhas anteriores como o OFFSET.
+    Busca limit + 1 linhas para saber se existe próxima página.
+    """
+    statement = statement.order_by(created_at_column.desc(), id_column.desc()).limit(limit + 1)
+    if cursor:
+        created_at, id = decode_cursor(cursor)
+        statement = statement.where(tuple_(created_at_column, id_column) < tuple_(created_at, id))
+    return statement
+
+def keyset_page(rows: Sequence[Any], limit: int) -> dict:
+    """Monta {"items", "next_cursor"} a partir das limit + 1 linhas buscadas."""
+    items: List[Any] = list(rows[:limit])
+    next_cursor = None
+    if len(rows) > limit and items:
+        last = items[-1]
+        next_cursor = encode_cursor(last.created_at, last.id)
+    return {"items": items, "next_cursor": next_cursor}
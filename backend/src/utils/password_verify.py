@@ -1,5 +1,9 @@
 from passlib.context import CryptContext
 from password_validator import PasswordValidator
+from concurrent.futures import ThreadPoolExecutor
+from src.core.config import get_settings
+from src.core.erros import PasswordHashingUnavailable
+import asyncio
 import secrets
 import string
 
@@ -14,7 +18,18 @@ password_schema \
     .has().symbols() \
     .no().spaces()
 
-password_context = CryptContext(schemes=["argon2"], deprecated="auto")
+def _argon2_options() -> dict:
+    settings = get_settings()
+    options = {
+        "argon2__rounds": settings.ARGON2_TIME_COST,
+        "argon2__memory_cost": settings.ARGON2_MEMORY_COST,
+        "argon2__parallelism": settings.ARGON2_PARALLELISM,
+        # o passlib só marca hashes com menos rounds que min_rounds como desatualizados
+        "argon2__min_rounds": settings.ARGON2_TIME_COST,
+    }
+    return {k: v for k, v in options.items() if v is not None}
+
+password_context = CryptContext(schemes=["argon2"], deprecated="auto", **_argon2_options())
 
 def generate_password_hash(pasword: str) -> str:
     hash = password_context.hash(pasword)
@@ -23,6 +38,58 @@ def generate_password_hash(pasword: str) -> str:
 def verify_password(password: str, hash: str) -> bool:
     return password_context.verify(password, hash=hash)
 
+def needs_rehash(hash: str) -> bool:
+    """Indica se o hash foi gerado com parâmetros do argon2 diferentes dos atuais (não roda o argon2)."""
+    return password_context.needs_update(hash)
+
+class PasswordHasherPool:
+    """
+    Executa o argon2 (que bloqueia por dezenas de ms) em um pool de threads
+    dedicado e limitado, fora do event loop. Com mais de max_pending
+    operações em andamento/na fila, rejeita na hora (503) em vez de
+    enfileirar indefinidamente.
+    """
+    def __init__(self, workers: int, max_pending: int) -> None:
+        self.workers = workers
+        self.max_pending = max_pending
+        self.pending = 0
+        self._executor = None
+
+    def _get_executor(self) -> ThreadPoolExecutor:
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix="argon2")
+        return self._executor
+
+    async def run(self, func, *args):
+        if self.pending >= self.max_pending:
+            raise PasswordHashingUnavailable()
+        self.pending += 1
+        try:
+            loop = asyncio.get_running_loop()
+            return await loop.run_in_executor(self._get_executor(), func, *args)
+        finally:
+            self.pending -= 1
+
+    @property
+    def idle(self) -> bool:
+        return self.pending < self.workers
+
+    def shutdown(self) -> None:
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+
+password_pool = PasswordHasherPool(
+    workers=get_settings().PASSWORD_HASH_WORKERS,
+    max_pending=get_settings().PASSWORD_HASH_MAX_PENDING,
+)
+
+async def generate_password_hash_async(password: str) -> str:
+    return await password_pool.run(password_context.hash, password)
+
+async def verify_password_async(password: str, hash: str) -> bool:
+    return await password_pool.run(password_context.verify, password, hash)
+
 def validate_password_strength(password: str) -> bool:
     """
     Verifica se a senha atende aos requisitos mínimos de segurança.
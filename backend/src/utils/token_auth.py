@@ -6,6 +6,10 @@ import logging
 from fastapi.exceptions import HTTPException
 from fastapi import status
 import logging
+import hashlib
+import time
+from collections import OrderedDict
+from typing import Optional
 from src.core.erros import InvalidToken, InvalidTokenError
 
 ACCESS_TOKEN_EXPIRY = 900
@@ -21,17 +25,65 @@ def create_access_token(user_data: dict, expiry: timedelta = None, refresh: bool
     )
     payload['jti'] = str(uuid.uuid4())
     payload['refresh'] = refresh
-    token = jwt.encode(payload=payload, key=get_settings().JWT_SECRET, algorithm=get_settings().JWT_ALGORITHM)
+    settings = get_settings()
+    token = jwt.encode(payload=payload, key=settings.JWT_SECRET, algorithm=settings.JWT_ALGORITHM)
     return token
 
+class VerifiedTokenCache:
+    """
+    Cache LRU limitado de claims já verificados, chaveado pelo digest do
+    token. Cada entrada vale até o exp do próprio token, então cada worker
+    verifica a assinatura de um token uma única vez.
+    """
+    def __init__(self, max_entries: int = 10_000) -> None:
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[bytes, tuple]" = OrderedDict()
+
+    @staticmethod
+    def digest(token: str) -> bytes:
+        return hashlib.sha256(token.encode("utf-8")).digest()
+
+    def get(self, key: bytes) -> Optional[dict]:
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        expires_at, claims = entry
+        if expires_at <= time.time():
+            self._entries.pop(key, None)
+            return None
+        self._entries.move_to_end(key)
+        return claims
+
+    def set(self, key: bytes, claims: dict) -> None:
+        expires_at = claims.get("exp")
+        if not isinstance(expires_at, (int, float)):
+            return
+        self._entries[key] = (expires_at, claims)
+        if len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        self._entries.clear()
+
+verified_tokens = VerifiedTokenCache()
+
 def decode_token(token: str) -> dict:
+    """
+    Valida o JWT e devolve os claims. O dict retornado pode ser
+    compartilhado entre requisições (cache) e não deve ser alterado.
+    """
+    key = verified_tokens.digest(token)
+    claims = verified_tokens.get(key)
+    if claims is not None:
+        return claims
+
+    settings = get_settings()
     try:
         token_data = jwt.decode(
             jwt=token,
-            key=get_settings().JWT_SECRET,
-            algorithms=[get_settings().JWT_ALGORITHM]
+            key=settings.JWT_SECRET,
+            algorithms=[settings.JWT_ALGORITHM]
         )
-        return token_data
     except jwt.ExpiredSignatureError:
         raise InvalidToken()
     except jwt.InvalidTokenError:
@@ -39,3 +91,5 @@ def decode_token(token: str) -> dict:
     except jwt.PyJWKError as e:
         logging.exception(e)
         return None
+    verified_tokens.set(key, token_data)
+    return token_data
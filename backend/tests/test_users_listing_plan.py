@@ -0,0 +1,84 @@
+"""
+Plano da listagem de /users (offset e cursor): deve usar o índice
+ix_users_institution_created_at_id, sem nó Sort.
+
+Precisa do Postgres do .env com as migrations aplicadas; sem .env válido
+ou sem banco acessível o teste é pulado. O seqscan é desligado na sessão para que
+tabelas pequenas não mascarem o resultado:
+
+    cd backend && python -m pytest -m postgres
+"""
+import asyncio
+import json
+import uuid
+from datetime import datetime
+
+import pytest
+from pydantic import ValidationError
+from sqlalchemy import text
+from sqlalchemy.dialects import postgresql
+from sqlalchemy.ext.asyncio import create_async_engine
+from sqlalchemy.pool import NullPool
+
+from src.core.config import get_settings
+
+# os módulos abaixo criam o engine na importação, a partir das Settings
+try:
+    get_settings()
+except ValidationError as e:
+    pytest.skip(f"Settings inválidas (sem .env?): {e.error_count()} erro(s)", allow_module_level=True)
+
+from src.models.user import User
+from src.services.user_service import users_listing_statement
+from src.utils.pagination import encode_cursor, keyset_paginate
+
+pytestmark = pytest.mark.postgres
+
+INDEX_NAME = "ix_users_institution_created_at_id"
+
+def _walk(plan: dict):
+    yield plan
+    for child in plan.get("Plans", []):
+        yield from _walk(child)
+
+def _statements():
+    base = users_listing_statement(uuid.uuid4())
+    cursor = encode_cursor(datetime(2026, 1, 1), uuid.uuid4())
+    return {
+        "offset": base.order_by(User.created_at.desc(), User.id.desc()).limit(50).offset(500),
+        "cursor_first_page": keyset_paginate(base, User.created_at, User.id, None, 50),
+        "cursor": keyset_paginate(base, User.created_at, User.id, cursor, 50),
+    }
+
+async def _explain(statement) -> list:
+    engine = create_async_engine(get_settings().SQLALCHEMY_DATABASE_URL, poolclass=NullPool)
+    try:
+        async with engine.connect() as conn:
+            await conn.execute(text("SET enable_seqscan = off"))
+            sql = statement.compile(dialect=postgresql.dialect(), compile_kwargs={"literal_binds": True})
+            raw = (await conn.execute(text(f"EXPLAIN (FORMAT JSON) {sql}"))).scalar()
+    finally:
+        await engine.dispose()
+    plan = (json.loads(raw) if isinstance(raw, str) else raw)[0]["Plan"]
+    return list(_walk(plan))
+
+@pytest.fixture(scope="module")
+def postgres():
+    async def ping():
+        engine = create_async_engine(get_settings().SQLALCHEMY_DATABASE_URL, poolclass=NullPool)
+        try:
+            async with engine.connect() as conn:
+                await conn.execute(text("SELECT 1"))
+        finally:
+            await engine.dispose()
+    try:
+        asyncio.run(ping())
+    except Exception as e:
+        pytest.skip(f"Postgres indisponível: {type(e).__name__}")
+
+@pytest.mark.parametrize("label", list(_statements()))
+def test_users_listing_uses_index_without_sort(postgres, label):
+    nodes = asyncio.run(_explain(_statements()[label]))
+    kinds = " > ".join(node["Node Type"] for node in nodes)
+    assert any(node.get("Index Name") == INDEX_NAME for node in nodes), kinds
+    assert not any(node["Node Type"] in ("Sort", "Incremental Sort") for node in nodes), kinds